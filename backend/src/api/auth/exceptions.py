@@ -0,0 +1,3 @@
+class GoogleLoginFailed(Exception):
+    def __init__(self, *args: object) -> None:
+        super().__init__(*args)
@@ -11,6 +11,7 @@ from src.logger import get_logger
 from src.models.jwt import JwtPlayload
 from src.modules.authentification import delete_loging_cookies, set_login_cookies
 
+from .exceptions import GoogleLoginFailed
 from .service import auth_google_callback_service
 
 router = APIRouter(prefix="/auth")
@@ -32,9 +33,7 @@ async def auth_google_login() -> RedirectResponse:
             "prompt": "consent",
         }
     )
-    response = RedirectResponse(
-        f"https://accounts.google.com/o/oauth2/v2/auth?{params}"
-    )
+    response = RedirectResponse(f"{auth_config.google.auth_url}?{params}")
     response.set_cookie(
         auth_config.session.oauth_state_keyword, state, httponly=True, samesite="lax"
     )
@@ -51,7 +50,11 @@ async def auth_google_callback(
     if state_cookie != state:
         raise HTTPException(status_code=400, detail="Invalid state")
 
-    user = await auth_google_callback_service(code)
+    try:
+        user = await auth_google_callback_service(code)
+    except GoogleLoginFailed:
+        logger.warning("google login failed", exc_info=True)
+        raise HTTPException(status_code=401, detail="Google login failed")
 
     response = RedirectResponse(auth_config.callback_redirect)
     response = delete_loging_cookies(response)
@@ -1,13 +1,21 @@
 import httpx
+from src.clients.http import get_http_client
 from src.clients.mysql.async_client import AMysqlClientReader, AMysqlClientWriter
 from src.config.auth import auth_config
 from src.models.database import User
+from src.modules.google_id_token import InvalidIdToken, verify_google_id_token
+from src.modules.user_cache import evict_cached_user
+
+from .exceptions import GoogleLoginFailed
 
 
 async def auth_google_callback_service(code: str) -> User:
-    async with httpx.AsyncClient() as client:
-        token_resp = await client.post(
-            "https://oauth2.googleapis.com/token",
+    """
+    Returns the user of the Google account, created on its first login.
+    """
+    try:
+        token_resp = await get_http_client().post(
+            auth_config.google.token_url,
             data={
                 "code": code,
                 "client_id": auth_config.google.client_id,
@@ -17,28 +25,23 @@ async def auth_google_callback_service(code: str) -> User:
             },
             headers={"Content-Type": "application/x-www-form-urlencoded"},
         )
+        token_resp.raise_for_status()
+        # Signed by Google, verified locally rather than asking for the userinfo
+        profile = await verify_google_id_token(token_resp.json()["id_token"])
+    except (httpx.HTTPError, KeyError, ValueError, InvalidIdToken) as e:
+        raise GoogleLoginFailed(str(e))
 
-        tokens = token_resp.json()
-        access_token = tokens["access_token"]
-
-        user_resp = await client.get(
-            "https://openidconnect.googleapis.com/v1/userinfo",
-            headers={"Authorization": f"Bearer {access_token}"},
-        )
-        profile = user_resp.json()
+    writer = AMysqlClientWriter()
+    user = User(
+        email=profile.email,
+        google_sub=profile.sub,
+        user_name=profile.name or profile.email or profile.sub,
+    )
+    # Unique google_sub: concurrent first logins end up with the same user
+    await writer.upsert_one(user)
+    evict_cached_user(user.id)
 
+    # Only the id is copied back: an existing user keeps its stored public_id,
+    # created_at and version. Pinned to the primary by the write.
     reader = AMysqlClientReader()
-    if users := await reader.select(
-        table=User, cond_equal=dict(google_sub=profile["sub"])
-    ):
-        user = users[0]
-    else:
-        writer = AMysqlClientWriter()
-        user = User(
-            email=profile["email"],
-            google_sub=profile["sub"],
-            user_name=profile["name"],
-        )
-        await writer.insert_one(user)
-
-    return user
+    return await reader.select_by_id(table=User, id=user.id)
@@ -0,0 +1,3 @@
+from .router import router as monitoring_router
+
+__all__ = ["monitoring_router"]
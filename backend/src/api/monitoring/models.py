@@ -0,0 +1,42 @@
+from pydantic import BaseModel
+
+
+class GetPoolsResponseItem(BaseModel):
+    pool_name: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class GetResultCacheResponse(BaseModel):
+    hits: int
+    misses: int
+    uncacheable: int
+    size: int
+    maxsize: int
+
+
+class GetQueriesResponseItem(BaseModel):
+    fingerprint: str
+    count: int
+    rows: int
+    total_ms: float
+    avg_ms: float
+    max_ms: float
+    pool_wait_ms: float
+    # Statements per latency bucket, e.g. "<=5ms", ">1000ms"
+    latency_histogram: dict[str, int]
+    # Statements per issuing "module.function"
+    callers: dict[str, int]
+
+
+class GetUserCacheResponse(BaseModel):
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
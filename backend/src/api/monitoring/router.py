@@ -0,0 +1,90 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter, HTTPException, Query, status
+from src.clients.mysql.async_client import (
+    LATENCY_BUCKETS_MS,
+    QueryStatsOrder,
+    get_pool_stats,
+    get_result_cache_stats,
+    get_top_queries,
+)
+from src.config.flags import flags_config
+from src.modules.user_cache import get_user_cache_stats
+
+from .models import (
+    GetPoolsResponseItem,
+    GetQueriesResponseItem,
+    GetResultCacheResponse,
+    GetUserCacheResponse,
+)
+
+router = APIRouter(prefix="/monitoring")
+
+
+@router.get("/pools", response_model=list[GetPoolsResponseItem])
+async def get_pools() -> list[GetPoolsResponseItem]:
+    """
+    Connection pools statistics of the worker handling the request.
+    """
+    if not flags_config.monitoring_endpoints:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    return [
+        GetPoolsResponseItem(pool_name=pool_name, **asdict(stats))
+        for pool_name, stats in get_pool_stats().items()
+    ]
+
+
+@router.get("/result_cache", response_model=GetResultCacheResponse)
+async def get_result_cache() -> GetResultCacheResponse:
+    """
+    Result cache statistics of the worker handling the request.
+    """
+    if not flags_config.monitoring_endpoints:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    return GetResultCacheResponse(**asdict(get_result_cache_stats()))
+
+
+@router.get("/user_cache", response_model=GetUserCacheResponse)
+async def get_user_cache() -> GetUserCacheResponse:
+    """
+    Logged in users cache statistics of the worker handling the request.
+    """
+    if not flags_config.monitoring_endpoints:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    return GetUserCacheResponse(**asdict(get_user_cache_stats()))
+
+
+_LATENCY_BUCKET_NAMES = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [
+    f">{LATENCY_BUCKETS_MS[-1]}ms"
+]
+
+
+@router.get("/queries", response_model=list[GetQueriesResponseItem])
+async def get_queries(
+    limit: int = Query(default=20, ge=1, le=200),
+    order: QueryStatsOrder = QueryStatsOrder.TOTAL_TIME,
+) -> list[GetQueriesResponseItem]:
+    """
+    Top statements of the worker handling the request, by fingerprint.
+    Empty unless MYSQL_QUERY_TELEMETRY is enabled.
+    """
+    if not flags_config.monitoring_endpoints:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    return [
+        GetQueriesResponseItem(
+            fingerprint=fingerprint,
+            count=stats.count,
+            rows=stats.rows,
+            total_ms=stats.total_s * 1e3,
+            avg_ms=stats.total_s / stats.count * 1e3,
+            max_ms=stats.max_s * 1e3,
+            pool_wait_ms=stats.pool_wait_s * 1e3,
+            latency_histogram=dict(zip(_LATENCY_BUCKET_NAMES, stats.latency_histogram)),
+            callers=dict(stats.callers.most_common()),
+        )
+        for fingerprint, stats in get_top_queries(limit, order)
+    ]
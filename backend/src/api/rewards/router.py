@@ -1,8 +1,17 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from src.logger import get_logger
-from src.models.database import User
-from src.modules.authentification import get_current_user
+from src.models.principal import Principal
+from src.modules.authentification import get_current_principal
 from src.modules.normalize_url import normalize_github_url
+from src.modules.pagination import (
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+)
 
 from .models import GetRewardsResponseItem
 from .service import get_rewards_service
@@ -13,11 +22,26 @@ logger = get_logger()
 
 @router.get("", response_model=list[GetRewardsResponseItem])
 async def get_rewards(
-    cycle_offset: int, user: User = Depends(get_current_user)
+    cycle_offset: int,
+    response: Response,
+    limit: int = Query(default=0, ge=0, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    user: Principal = Depends(get_current_principal),
 ) -> list[GetRewardsResponseItem]:
-    logger.info(f"GET patch_task, {cycle_offset=}")
+    logger.info(f"GET patch_task, {cycle_offset=} {limit=}")
+
+    try:
+        after = None if cursor is None else decode_cursor(cursor, tuple[datetime, int])
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail="Invalid cursor."
+        )
 
-    rewards = await get_rewards_service(user, cycle_offset)
+    rewards = await get_rewards_service(user, cycle_offset, limit, after)
+    if limit and len(rewards) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            (rewards[-1].created_at, rewards[-1].id)
+        )
 
     return [
         GetRewardsResponseItem(
@@ -1,9 +1,21 @@
+from datetime import datetime
+
 from src.clients.mysql import AMysqlClientReader
 from src.models.database import Reward, User
+from src.models.principal import Principal
 from src.modules.date import get_first_day_of_cycle
 
 
-async def get_rewards_service(user: User, cycle_offset: int) -> list[Reward]:
+async def get_rewards_service(
+    user: User | Principal,
+    cycle_offset: int,
+    limit: int = 0,
+    after: tuple[datetime, int] | None = None,
+) -> list[Reward]:
+    """
+    Rewards of the cycle, by creation date.
+    If limit, only a page of them after the (created_at, id) keyset.
+    """
     reader = AMysqlClientReader()
 
     return await reader.select(
@@ -11,4 +23,7 @@ async def get_rewards_service(user: User, cycle_offset: int) -> list[Reward]:
         cond_equal=dict(user_id=user.id),
         cond_greater_or_eq=dict(created_at=get_first_day_of_cycle(cycle_offset)),
         cond_less=dict(created_at=get_first_day_of_cycle(cycle_offset - 1)),
+        order_by="created_at, id",
+        limit=limit,
+        after=after or (),
     )
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
 from .auth import auth_router
+from .monitoring import monitoring_router
 from .rewards import rewards_router
 from .tasks import tasks_router
 from .users import users_router
@@ -8,6 +9,7 @@ from .users import users_router
 router = APIRouter(prefix="/api")
 
 router.include_router(auth_router)
+router.include_router(monitoring_router)
 router.include_router(rewards_router)
 router.include_router(tasks_router)
 router.include_router(users_router)
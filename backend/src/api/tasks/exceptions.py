@@ -21,3 +21,8 @@ class UserNotReviewer(Exception):
 class PrLinkAlreadyExists(Exception):
     def __init__(self, *args: object) -> None:
         super().__init__(*args)
+
+
+class TaskWrongState(Exception):
+    def __init__(self, *args: object) -> None:
+        super().__init__(*args)
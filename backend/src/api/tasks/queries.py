@@ -0,0 +1,101 @@
+"""
+Guarded statements of the task state machine, that AMysqlClientWriter can not build.
+
+Each statement only matches a task the user may act on and in a state the
+action is allowed from, so the affected rows tell whether the action happened.
+"""
+
+from functools import cache
+
+from src.models.database import Reward, RewardCycleTotal, Task, TaskReviewer, User
+
+# Locks the task :task_id while in the state :from_state, until the commit
+_LOCK_TASK_IN_STATE = """
+SELECT t.id FROM {tasks} AS t
+WHERE t.id = :task_id AND t.state = :from_state
+FOR UPDATE ;
+"""
+
+# Reward of the reviewer :user_id for the task :task_id, from the task (its persisted points) and its creator
+_INSERT_REVIEW_REWARD = """
+INSERT INTO {rewards} (
+    user_id, task_id, points, pr_link, was_quick_review,
+    creator_public_id, creator_user_name, review_priority, lines_of_code, created_at
+)
+SELECT
+    tr.user_id, t.id, t.points, t.pr_link, t.has_been_reviewed_once,
+    c.public_id, c.user_name, t.review_priority, t.lines_of_code, :created_at
+FROM {tasks} AS t
+JOIN {users} AS c ON c.id = t.creator_id
+JOIN {task_reviewers} AS tr ON tr.task_id = t.id AND tr.user_id = :user_id
+WHERE t.id = :task_id AND t.state = :from_state ;
+"""
+
+
+# Adds the reward just inserted on the connection to the total of its cycle
+_ADD_REWARD_TO_CYCLE_TOTAL = """
+INSERT INTO {totals} (user_id, cycle_start, points, reviews, quick_reviews)
+SELECT * FROM (
+    SELECT
+        r.user_id, :cycle_start AS cycle_start, r.points,
+        1 AS reviews, r.was_quick_review AS quick_reviews
+    FROM {rewards} AS r
+    WHERE r.id = LAST_INSERT_ID()
+) AS new
+ON DUPLICATE KEY UPDATE
+    points = {totals}.points + new.points,
+    reviews = {totals}.reviews + new.reviews,
+    quick_reviews = {totals}.quick_reviews + new.quick_reviews ;
+"""
+
+
+# Points of the task :task_id under the current rules, after a change of its columns
+_SET_TASK_POINTS = """
+UPDATE {tasks} AS t
+SET points = {points}, points_version = :points_version
+WHERE t.id = :task_id ;
+"""
+
+
+@cache
+def lock_task_in_state_query() -> str:
+    """
+    Args: task_id, from_state.
+    Taken first by a transition reading the task before writing it: the read
+    locks of two concurrent transitions would otherwise deadlock on the write.
+    """
+    return _LOCK_TASK_IN_STATE.format(tasks=Task.__tablename__)
+
+
+@cache
+def insert_review_reward_query() -> str:
+    """
+    Args: user_id, task_id, from_state, created_at.
+    """
+    return _INSERT_REVIEW_REWARD.format(
+        rewards=Reward.__tablename__,
+        tasks=Task.__tablename__,
+        users=User.__tablename__,
+        task_reviewers=TaskReviewer.__tablename__,
+    )
+
+
+@cache
+def add_reward_to_cycle_total_query() -> str:
+    """
+    Args: cycle_start.
+    To run right after insert_review_reward_query, on the same connection.
+    """
+    return _ADD_REWARD_TO_CYCLE_TOTAL.format(
+        totals=RewardCycleTotal.__tablename__, rewards=Reward.__tablename__
+    )
+
+
+@cache
+def set_task_points_query() -> str:
+    """
+    Args: task_id, points_version.
+    """
+    return _SET_TASK_POINTS.format(
+        tasks=Task.__tablename__, points=Task.calculate_reward_sql("t")
+    )
@@ -1,14 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from src.clients.mysql import query_deadline
 from src.logger import get_logger
 from src.models.database import TaskState, User
-from src.modules.authentification import get_current_user
+from src.models.principal import Principal
+from src.modules.authentification import get_current_principal, get_current_user
 from src.modules.normalize_url import normalize_github_url
+from src.modules.pagination import (
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+)
 
 from .exceptions import (
     CreatorNotFound,
     PrLinkAlreadyExists,
     TaskAndUserMismatch,
     TaskNotFound,
+    TaskWrongState,
     UserNotReviewer,
 )
 from .models import (
@@ -29,6 +39,21 @@ from .service import (
 router = APIRouter(prefix="/tasks")
 logger = get_logger()
 
+# Seconds a listing may spend on its queries
+LIST_QUERY_DEADLINE = 5
+
+
+def _decode_task_cursor(cursor: str | None) -> int | None:
+    if cursor is None:
+        return None
+    try:
+        (task_id,) = decode_cursor(cursor, tuple[int])
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail="Invalid cursor."
+        )
+    return task_id
+
 
 @router.post("", status_code=status.HTTP_204_NO_CONTENT)
 async def post_task(
@@ -89,15 +114,31 @@ async def patch_task(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"User not authorized to perfom action on the task.",
         )
+    except TaskWrongState:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Action not allowed in the current state of the task.",
+        )
 
 
 @router.get("/todo", response_model=list[GetTodoResponseItem])
 async def get_todo(
-    state: TaskState, user: User = Depends(get_current_user)
+    state: TaskState,
+    response: Response,
+    limit: int = Query(default=0, ge=0, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    user: Principal = Depends(get_current_principal),
 ) -> list[GetTodoResponseItem]:
-    logger.info(f"GET get_todo, {state!r}")
+    logger.info(f"GET get_todo, {state!r} {limit=}")
 
-    task_user_reviewers_ls = await get_todo_service(user, state)
+    with query_deadline(LIST_QUERY_DEADLINE):
+        task_user_reviewers_ls = await get_todo_service(
+            user, state, limit, _decode_task_cursor(cursor)
+        )
+    if limit and len(task_user_reviewers_ls) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            (task_user_reviewers_ls[-1][0].id,)
+        )
     return [
         GetTodoResponseItem(
             task_id=t.id,
@@ -108,7 +149,7 @@ async def get_todo(
             created_at=t.created_at,
             approved_at=t.approved_at,
             state=t.state.value,
-            reward=t.calculate_reward(),
+            reward=t.points,
             has_been_reviewed_once=t.has_been_reviewed_once,
             pr_link=t.pr_link,
             pr_number=gu.pull_request_number if gu else None,
@@ -129,11 +170,22 @@ async def get_todo(
 
 @router.get("/my_tasks", response_model=list[GetMyTasksResponseItem])
 async def get_created(
-    state: TaskState, user: User = Depends(get_current_user)
+    state: TaskState,
+    response: Response,
+    limit: int = Query(default=0, ge=0, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    user: Principal = Depends(get_current_principal),
 ) -> list[GetMyTasksResponseItem]:
-    logger.info(f"GET get_created, {state!r}")
+    logger.info(f"GET get_created, {state!r} {limit=}")
 
-    task_reviewers_ls = await get_created_service(user, state)
+    with query_deadline(LIST_QUERY_DEADLINE):
+        task_reviewers_ls = await get_created_service(
+            user, state, limit, _decode_task_cursor(cursor)
+        )
+    if limit and len(task_reviewers_ls) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            (task_reviewers_ls[-1][0].id,)
+        )
     return [
         GetMyTasksResponseItem(
             task_id=t.id,
@@ -144,7 +196,7 @@ async def get_created(
             created_at=t.created_at,
             approved_at=t.approved_at,
             state=t.state.value,
-            reward=t.calculate_reward(),
+            reward=t.points,
             has_been_reviewed_once=t.has_been_reviewed_once,
             pr_link=t.pr_link,
             github_repo=gu.repo if gu else None,
@@ -1,13 +1,15 @@
 from datetime import datetime, timezone
+from typing import NoReturn
 
 from src.clients.mysql import (
     AMysqlClientReader,
     AMysqlClientWriter,
     AMySqlDuplicateError,
     AMySqlIdNotFoundError,
+    Join,
 )
 from src.models.database import (
-    Reward,
+    REWARD_RULES_VERSION,
     Task,
     TaskArchive,
     TaskLinesOfCode,
@@ -18,6 +20,8 @@ from src.models.database import (
     User,
     UUID4Str,
 )
+from src.models.principal import Principal
+from src.modules.date import get_cycle_start
 from src.modules.normalize_url import normalize_github_url
 
 from .exceptions import (
@@ -25,9 +29,16 @@ from .exceptions import (
     PrLinkAlreadyExists,
     TaskAndUserMismatch,
     TaskNotFound,
+    TaskWrongState,
     UserNotReviewer,
 )
 from .models import UpdateAction
+from .queries import (
+    add_reward_to_cycle_total_query,
+    insert_review_reward_query,
+    lock_task_in_state_query,
+    set_task_points_query,
+)
 
 
 async def post_task_service(
@@ -61,101 +72,129 @@ async def post_task_service(
         pr_link=pr_link,
         state=TaskState.PENDING_REVIEW,
     )
-
-    try:
-        await writer.insert_one(task)
-    except AMySqlDuplicateError:
-        raise PrLinkAlreadyExists()
-
-    task_reviewers = [TaskReviewer(user_id=u.id, task_id=task.id) for u in users]
-
-    await writer.insert(task_reviewers)
+    task.refresh_points()
+
+    async with writer.transaction():
+        try:
+            await writer.insert_one(task)
+        except AMySqlDuplicateError:
+            raise PrLinkAlreadyExists()
+
+        task_reviewers = [TaskReviewer(user_id=u.id, task_id=task.id) for u in users]
+
+        await writer.insert(task_reviewers)
+
+
+# Tasks reviewed by the user (me)
+_TODO_PAGE_JOINS = [
+    Join(table=TaskReviewer, alias="me", on="me.task_id = t.id", fetch=False),
+]
+# with their creator (c) and all their reviewers (r)
+_TODO_JOINS = _TODO_PAGE_JOINS + [
+    Join(table=User, alias="c", on="c.id = t.creator_id"),
+    Join(table=TaskReviewer, alias="tr", on="tr.task_id = t.id", fetch=False),
+    Join(table=User, alias="r", on="r.id = tr.user_id"),
+]
+# Tasks with their reviewers (r) other than the creator, if any
+_CREATED_JOINS = [
+    Join(
+        table=TaskReviewer,
+        alias="tr",
+        on="tr.task_id = t.id AND tr.user_id <> t.creator_id",
+        left=True,
+        fetch=False,
+    ),
+    Join(table=User, alias="r", on="r.id = tr.user_id", left=True),
+]
 
 
 async def get_todo_service(
-    user: User, state: TaskState
+    user: User | Principal, state: TaskState, limit: int = 0, after: int | None = None
 ) -> list[tuple[Task, User, list[User]]]:
     """
-    Returns tasks assignated to the user.
+    Returns tasks assignated to the user, by id.
+    If limit, only a page of them with an id greater than after.
     tuples of (task, task creator, task reviewers)
     """
-    reader = AMysqlClientReader()
-
-    user_task_reviewers = await reader.select(
-        table=TaskReviewer, cond_equal=dict(user_id=user.id)
-    )
+    reader = AMysqlClientReader(prepared_statements=True)
+
+    cond_in: dict[str, list] = dict()
+    if limit:
+        # The joined rows are many per task, the page is made on the tasks first.
+        # Ordered on me.task_id (= t.id) to walk the (user_id, task_id) index.
+        page = await reader.select_join(
+            table=Task,
+            alias="t",
+            joins=_TODO_PAGE_JOINS,
+            cond_equal={"me.user_id": user.id, "t.state": state.value},
+            order_by="me.task_id",
+            limit=limit,
+            after=() if after is None else (after,),
+        )
+        cond_in = {"t.id": [task.id for task, in page]}
 
-    tasks = await reader.select(
+    rows = await reader.select_join(
         table=Task,
-        cond_in=dict(id=list({r.task_id for r in user_task_reviewers})),
-        cond_equal=dict(state=state.value),
-    )
-    tasks_reviewers = await reader.select(
-        table=TaskReviewer, cond_in=dict(task_id=[t.id for t in tasks])
+        alias="t",
+        joins=_TODO_JOINS,
+        cond_in=cond_in,
+        cond_equal={"me.user_id": user.id, "t.state": state.value},
+        order_by="t.id, tr.id",
     )
 
-    users = await reader.select(
-        table=User,
-        cond_in=dict(
-            id=list(
-                {t.creator_id for t in tasks}.union(
-                    {tr.user_id for tr in tasks_reviewers}
-                )
-            )
-        ),
-    )
-    user_id_to_user_map: dict[int, User] = {u.id: u for u in users}
-
-    return [
-        (
-            t,
-            user_id_to_user_map[t.creator_id],
-            [
-                user_id_to_user_map[tr.user_id]
-                for tr in tasks_reviewers
-                if tr.task_id == t.id
-            ],
+    task_id_to_todo_map: dict[int, tuple[Task, User, list[User]]] = dict()
+    for task, creator, reviewer in rows:
+        task_id_to_todo_map.setdefault(task.id, (task, creator, list()))[2].append(
+            reviewer
         )
-        for t in tasks
-    ]
+
+    return list(task_id_to_todo_map.values())
 
 
 async def get_created_service(
-    user: User, state: TaskState
+    user: User | Principal, state: TaskState, limit: int = 0, after: int | None = None
 ) -> list[tuple[Task, list[User]]]:
     """
-    Return tasks with their list of reviewers
+    Return tasks with their list of reviewers, by id.
+    If limit, only a page of them with an id greater than after.
     """
     reader = AMysqlClientReader()
 
-    tasks = await reader.select(
-        table=Task, cond_equal=dict(creator_id=user.id, state=state.value)
-    )
-
-    task_reviewers = await reader.select(
-        table=TaskReviewer,
-        cond_in=dict(task_id=[t.id for t in tasks]),
-        cond_non_equal=dict(user_id=user.id),
-    )
+    cond_in: dict[str, list] = dict()
+    if limit:
+        # The joined rows are many per task, the page is made on the tasks first
+        page = await reader.select(
+            table=Task,
+            cond_equal=dict(creator_id=user.id, state=state.value),
+            order_by="id",
+            limit=limit,
+            after=() if after is None else (after,),
+            columns=["id"],
+        )
+        cond_in = {"t.id": [task.id for task in page]}
 
-    users = await reader.select(
-        table=User, cond_in=dict(id=list({u.user_id for u in task_reviewers}))
+    rows = await reader.select_join(
+        table=Task,
+        alias="t",
+        joins=_CREATED_JOINS,
+        cond_in=cond_in,
+        cond_equal={"t.creator_id": user.id, "t.state": state.value},
+        order_by="t.id, tr.id",
     )
-    user_id_to_user_map: dict[int, User] = {u.id: u for u in users}
 
-    task_id_to_reviewers_map: dict[int, list[User]] = dict()
-    for tr in task_reviewers:
-        task_id_to_reviewers_map.setdefault(tr.task_id, list()).append(
-            user_id_to_user_map[tr.user_id]
-        )
+    task_id_to_created_map: dict[int, tuple[Task, list[User]]] = dict()
+    for task, reviewer in rows:
+        reviewers = task_id_to_created_map.setdefault(task.id, (task, list()))[1]
+        if reviewer is not None:
+            reviewers.append(reviewer)
 
-    return [(t, task_id_to_reviewers_map[t.id]) for t in tasks]
+    return list(task_id_to_created_map.values())
 
 
 async def _validate_and_get_task(
     user: User, task_id: int, *, task_belongs_to_user: bool
 ) -> Task:
-    reader = AMysqlClientReader()
+    reader = AMysqlClientReader(prepared_statements=True)
 
     try:
         task = await reader.select_by_id(table=Task, id=task_id)
@@ -168,76 +207,114 @@ async def _validate_and_get_task(
     return task
 
 
-async def _patch_approval_service(user: User, task_id: int, *, approved: bool) -> None:
-    task = await _validate_and_get_task(user, task_id, task_belongs_to_user=False)
+async def _raise_transition_error(
+    user: User, task_id: int, *, task_belongs_to_user: bool
+) -> NoReturn:
+    """
+    A guarded transition matched no task, finds out why.
+    Only runs on the failure path.
+    """
+    task = await _validate_and_get_task(
+        user, task_id, task_belongs_to_user=task_belongs_to_user
+    )
 
-    reader = AMysqlClientReader()
+    if not task_belongs_to_user:
+        reader = AMysqlClientReader()
+        if not await reader.id_exists(table=User, id=task.creator_id):
+            raise CreatorNotFound()
+        if not await reader.select(
+            table=TaskReviewer,
+            cond_equal=dict(user_id=user.id, task_id=task.id),
+            columns=["id"],
+        ):
+            raise UserNotReviewer()
 
-    try:
-        creator = await reader.select_by_id(table=User, id=task.creator_id)
-    except AMySqlIdNotFoundError:
-        raise CreatorNotFound()
+    raise TaskWrongState()
 
-    if not await reader.select(
-        table=TaskReviewer, cond_equal=dict(user_id=user.id, task_id=task.id)
-    ):
-        raise UserNotReviewer()
 
+async def _patch_approval_service(user: User, task_id: int, *, approved: bool) -> None:
     writer = AMysqlClientWriter()
 
-    await writer.insert_one(
-        Reward(
-            user_id=user.id,
-            task_id=task.id,
-            points=task.calculate_reward(),
-            was_quick_review=task.has_been_reviewed_once,
-            pr_link=task.pr_link,
-            creator_public_id=creator.public_id,
-            creator_user_name=creator.user_name,
-            review_priority=task.review_priority,
-            lines_of_code=task.lines_of_code,
+    now = datetime.now(timezone.utc)
+    state = TaskState.APPROVED.value if approved else TaskState.PENDING_CHANGES.value
+
+    async with writer.transaction():
+        # A concurrent review of the task waits here, then finds it in another state
+        if not await writer.execute(
+            query=lock_task_in_state_query(),
+            args=dict(task_id=task_id, from_state=TaskState.PENDING_REVIEW.value),
+        ):
+            await _raise_transition_error(user, task_id, task_belongs_to_user=False)
+        # Reward first, it is computed from the task before the review
+        if not await writer.execute(
+            query=insert_review_reward_query(),
+            args=dict(
+                user_id=user.id,
+                task_id=task_id,
+                from_state=TaskState.PENDING_REVIEW.value,
+                created_at=now,
+            ),
+            affected_rows=True,
+        ):
+            await _raise_transition_error(user, task_id, task_belongs_to_user=False)
+        await writer.execute(
+            query=add_reward_to_cycle_total_query(),
+            args=dict(cycle_start=get_cycle_start(now.date())),
         )
-    )
 
-    state = TaskState.APPROVED.value if approved else TaskState.PENDING_CHANGES.value
-    approved_at = datetime.now(timezone.utc) if approved else None
-    await writer.update_by_id(
-        table=Task,
-        id=task.id,
-        col_to_value_map=dict(
-            has_been_reviewed_once=1, state=state, approved_at=approved_at
-        ),
-    )
+        if not await writer.update_where(
+            table=Task,
+            col_to_value_map=dict(
+                has_been_reviewed_once=1,
+                state=state,
+                approved_at=now if approved else None,
+            ),
+            cond_equal=dict(id=task_id, state=TaskState.PENDING_REVIEW.value),
+        ):
+            # Locked in this state above, kept as a guard: the reward is rolled back
+            raise TaskWrongState()
+        # Reviewed once now, the next reviews are not worth the same
+        await writer.execute(
+            query=set_task_points_query(),
+            args=dict(task_id=task_id, points_version=REWARD_RULES_VERSION),
+        )
 
 
 async def _patch_changes_addressed_service(user: User, task_id: int) -> None:
-    task = await _validate_and_get_task(user, task_id, task_belongs_to_user=True)
-
     writer = AMysqlClientWriter()
 
-    await writer.update_by_id(
+    if not await writer.update_where(
         table=Task,
-        id=task.id,
         col_to_value_map=dict(state=TaskState.PENDING_REVIEW.value),
-    )
+        cond_equal=dict(
+            id=task_id, creator_id=user.id, state=TaskState.PENDING_CHANGES.value
+        ),
+    ):
+        await _raise_transition_error(user, task_id, task_belongs_to_user=True)
 
 
 async def _patch_task_re_open(
     user: User, task_id: int, *, reset_has_been_reviewed_once: bool
 ) -> None:
-    task = await _validate_and_get_task(user, task_id, task_belongs_to_user=True)
-
     writer = AMysqlClientWriter()
 
-    await writer.update_by_id(
-        table=Task,
-        id=task.id,
-        col_to_value_map=dict(
-            state=TaskState.PENDING_REVIEW.value,
-            approved_at=None,
-            has_been_reviewed_once=not reset_has_been_reviewed_once,
-        ),
-    )
+    async with writer.transaction():
+        if not await writer.update_where(
+            table=Task,
+            col_to_value_map=dict(
+                state=TaskState.PENDING_REVIEW.value,
+                approved_at=None,
+                has_been_reviewed_once=int(not reset_has_been_reviewed_once),
+            ),
+            cond_equal=dict(
+                id=task_id, creator_id=user.id, state=TaskState.APPROVED.value
+            ),
+        ):
+            await _raise_transition_error(user, task_id, task_belongs_to_user=True)
+        await writer.execute(
+            query=set_task_points_query(),
+            args=dict(task_id=task_id, points_version=REWARD_RULES_VERSION),
+        )
 
 
 async def patch_task_service(user: User, task_id: int, action: UpdateAction) -> None:
@@ -259,17 +336,18 @@ async def delete_task_service(user: User, task_id: int) -> None:
 
     writer = AMysqlClientWriter()
 
-    await writer.delete_by_id(table=Task, id=task.id)
-    task_reviewers = await writer.delete(
-        table=TaskReviewer, cond_equal=dict(task_id=task.id)
-    )
+    async with writer.transaction():
+        await writer.delete_by_id(table=Task, id=task.id)
+        task_reviewers = await writer.delete(
+            table=TaskReviewer, cond_equal=dict(task_id=task.id)
+        )
 
-    await writer.insert_one(
-        TaskArchive.model_validate(task.model_dump(), by_alias=True)
-    )
-    await writer.insert(
-        [
-            TaskReviewerArchive.model_validate(tr.model_dump(), by_alias=True)
-            for tr in task_reviewers
-        ]
-    )
+        await writer.insert_one(
+            TaskArchive.model_validate(task.model_dump(), by_alias=True)
+        )
+        await writer.insert(
+            [
+                TaskReviewerArchive.model_validate(tr.model_dump(), by_alias=True)
+                for tr in task_reviewers
+            ]
+        )
@@ -7,11 +7,11 @@ from src.config.auth import auth_config
 from src.config.env import ENV, ServiceEnv
 from src.config.flags import flags_config
 from src.logger import get_logger
-from src.models.database import User
 from src.models.jwt import JwtPlayload
+from src.models.principal import Principal
 from src.modules.authentification import (
     delete_loging_cookies,
-    get_current_user,
+    get_current_principal,
     set_login_cookies,
 )
 
@@ -35,7 +35,7 @@ async def get_users() -> list[GetUsersResponseItem]:
 
 
 @router.get("/me", response_model=GetUserResponse)
-async def get_me(user: User = Depends(get_current_user)) -> GetUserResponse:
+async def get_me(user: Principal = Depends(get_current_principal)) -> GetUserResponse:
     logger.info("GET get_me")
 
     return GetUserResponse(
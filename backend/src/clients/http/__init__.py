@@ -0,0 +1,3 @@
+from .client import close_http_client, get_http_client, init_http_client
+
+__all__ = ["close_http_client", "get_http_client", "init_http_client"]
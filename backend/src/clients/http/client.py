@@ -0,0 +1,39 @@
+import httpx
+
+# Seconds, for each of connect, read, write and pool
+HTTP_TIMEOUT = 10
+HTTP_MAX_CONNECTIONS = 20
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+
+http_client: httpx.AsyncClient | None = None
+
+
+def init_http_client() -> httpx.AsyncClient:
+    """
+    Creates the client shared by the outgoing requests of the worker, its pool
+    keeps the connections alive between them.
+    """
+    global http_client
+    if http_client is None:
+        http_client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+    return http_client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    The shared client, created on first use outside of the app lifespan (e.g. scripts).
+    """
+    return http_client or init_http_client()
+
+
+async def close_http_client() -> None:
+    global http_client
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
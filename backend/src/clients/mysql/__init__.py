@@ -3,6 +3,12 @@ from .async_client import (
     AMysqlClientWriter,
     AMySqlDuplicateError,
     AMySqlIdNotFoundError,
+    AMySqlTimeoutError,
+    Join,
+    dispose_engines,
+    init_engines,
+    query_deadline,
+    start_primary_pin,
 )
 from .sync_client import MysqlClientReader, MysqlClientWriter
 
@@ -11,6 +17,12 @@ __all__ = [
     "AMysqlClientWriter",
     "AMySqlDuplicateError",
     "AMySqlIdNotFoundError",
+    "AMySqlTimeoutError",
+    "Join",
     "MysqlClientReader",
     "MysqlClientWriter",
+    "dispose_engines",
+    "init_engines",
+    "query_deadline",
+    "start_primary_pin",
 ]
@@ -1,9 +1,45 @@
-from .client import AMysqlClientReader, AMysqlClientWriter
-from .exceptions import AMySqlDuplicateError, AMySqlIdNotFoundError
+from .client import (
+    AMysqlClientReader,
+    AMysqlClientWriter,
+    dispose_engines,
+    get_pool_stats,
+    init_engines,
+)
+from .deadline import query_deadline
+from .exceptions import AMySqlDuplicateError, AMySqlIdNotFoundError, AMySqlTimeoutError
+from .models import Join
+from .pool import PoolStats
+from .prepared import PreparedStatementStats, get_prepared_statement_stats
+from .result_cache import ResultCacheStats, get_result_cache_stats
+from .routing import start_primary_pin
+from .telemetry import (
+    LATENCY_BUCKETS_MS,
+    QueryStats,
+    QueryStatsOrder,
+    get_top_queries,
+    reset_query_stats,
+)
 
 __all__ = [
+    "LATENCY_BUCKETS_MS",
     "AMysqlClientReader",
     "AMysqlClientWriter",
     "AMySqlDuplicateError",
     "AMySqlIdNotFoundError",
+    "AMySqlTimeoutError",
+    "Join",
+    "PoolStats",
+    "PreparedStatementStats",
+    "QueryStats",
+    "QueryStatsOrder",
+    "ResultCacheStats",
+    "dispose_engines",
+    "get_pool_stats",
+    "get_prepared_statement_stats",
+    "get_result_cache_stats",
+    "get_top_queries",
+    "init_engines",
+    "query_deadline",
+    "reset_query_stats",
+    "start_primary_pin",
 ]
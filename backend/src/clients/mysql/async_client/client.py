@@ -1,39 +1,110 @@
 ## NOTE: This client is async and should not be used with scripts, but with FAST API
+import asyncio
+import time
 import traceback
 from abc import ABC, abstractmethod
-from logging import Logger
-from typing import Any, Literal, Type, TypeVar, overload
-from uuid import uuid4
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from itertools import batched
+from logging import DEBUG, Logger
+from typing import (
+    Any,
+    AsyncIterator,
+    Iterator,
+    Literal,
+    Self,
+    Sequence,
+    Type,
+    TypeVar,
+    overload,
+)
 
-from sqlalchemy import CursorResult, text
-from sqlalchemy.exc import IntegrityError, ProgrammingError
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy import Row, TextClause, text
+from sqlalchemy.exc import DBAPIError, IntegrityError, ProgrammingError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
 from src.config.mysql import mysql_config
 from src.logger import get_logger
+from src.models.aggregate import Aggregate, render_aggregate_select
 from src.models.database import BaseTableModel
 
+from .deadline import (
+    MAX_EXECUTION_TIME_EXCEEDED_ERROR,
+    statement_timeout,
+    with_max_execution_time,
+)
 from .exceptions import (
+    AMySqlColumnInconsistencyError,
     AMySqlDuplicateError,
     AMySqlIdNotFoundError,
     AMySqlNoEngineError,
+    AMySqlTimeoutError,
     AMySqlWrongQueryError,
 )
-from .models import CondReturn
+from .models import CondReturn, Join
+from .pool import (
+    PoolStats,
+    collect_pool_stats,
+    record_checkout,
+    record_checkout_timeout,
+)
+from .prepared import execute_prepared
+from .replicas import ReplicaSet, is_healthy
+from .result_cache import (
+    bump_table_versions,
+    get_cached_rows,
+    store_rows,
+    written_tables,
+)
+from .query_cache import (
+    bind,
+    cond_shape_and_values,
+    get_compiled_query,
+    keyset_values,
+    param_name,
+    render_cond,
+    render_keyset,
+    render_order_by,
+)
+from .routing import is_pinned_to_primary, pin_reads_to_primary
+from .telemetry import CHECKOUT_WAIT_INFO_KEY, StatementRun, record_statement
 
 base_logger = get_logger()
-engine_reader = None
-engine_writer = None
+# Ids per DELETE statement, keeps the IN lists bounded
+DELETE_CHUNK_SIZE = 1000
+# Rows fetched at once by the server-side cursor of select_iter
+STREAM_BATCH_SIZE = 1000
+# Estimated size of the statement sent per insert chunk. The driver splits a
+# multi-row insert past 1,024,000 bytes, its lastrowid would then be the first
+# id of the last statement only. Also well under the server max_allowed_packet.
+INSERT_CHUNK_MAX_BYTES = 512_000
+engine_reader: AsyncEngine | None = None
+engine_writer: AsyncEngine | None = None
+replica_set: ReplicaSet | None = None
+_health_check_task: asyncio.Task | None = None
+
+
+def _create_engine(
+    user: str,
+    password: str,
+    host: str = mysql_config.host,
+    port: int = mysql_config.port,
+) -> AsyncEngine:
+    return create_async_engine(
+        f"mysql+asyncmy://{user}:{password}@{host}:{port}/{mysql_config.database}",
+        pool_size=mysql_config.pool_size,
+        max_overflow=mysql_config.pool_max_overflow,
+        pool_timeout=mysql_config.pool_timeout,
+        pool_recycle=mysql_config.pool_recycle,
+        pool_pre_ping=mysql_config.pool_pre_ping,
+    )
 
 
 def _get_engine_reader() -> AsyncEngine:
     global engine_reader
     if engine_reader is None:
-        engine_reader = create_async_engine(
-            f"mysql+asyncmy://{mysql_config.user_reader}:{mysql_config.password_reader}@{mysql_config.host}:{mysql_config.port}/{mysql_config.database}",
-            pool_size=5,
-            max_overflow=5,
-            pool_timeout=60,
-            pool_recycle=1800,
+        engine_reader = _create_engine(
+            mysql_config.user_reader, mysql_config.password_reader
         )
     return engine_reader
 
@@ -41,23 +112,184 @@ def _get_engine_reader() -> AsyncEngine:
 def _get_engine_writer() -> AsyncEngine:
     global engine_writer
     if engine_writer is None:
-        engine_writer = create_async_engine(
-            f"mysql+asyncmy://{mysql_config.user_writer}:{mysql_config.password_writer}@{mysql_config.host}:{mysql_config.port}/{mysql_config.database}",
-            pool_size=5,
-            max_overflow=5,
-            pool_timeout=60,
-            pool_recycle=1800,
+        engine_writer = _create_engine(
+            mysql_config.user_writer, mysql_config.password_writer
         )
     return engine_writer
 
 
+def _get_replica_set() -> ReplicaSet | None:
+    """
+    The replicas of the config, None if there is none.
+    """
+    global replica_set
+    if replica_set is None and mysql_config.replica_hosts:
+        engines: dict[str, AsyncEngine] = dict()
+        for replica_host in mysql_config.replica_hosts:
+            host, _, port = replica_host.partition(":")
+            engines[f"replica:{replica_host}"] = _create_engine(
+                mysql_config.user_reader,
+                mysql_config.password_reader,
+                host,
+                int(port or mysql_config.port),
+            )
+        replica_set = ReplicaSet(engines, mysql_config.replica_balancing, base_logger)
+    return replica_set
+
+
+async def _warm_up(engine: AsyncEngine) -> None:
+    async def open_connection() -> AsyncConnection:
+        conn = await engine.connect()
+        await conn.exec_driver_sql("SELECT 1")
+        return conn
+
+    conns = await asyncio.gather(
+        *(open_connection() for _ in range(mysql_config.pool_size))
+    )
+    # Back to the pool, where they stay open for the next checkouts
+    for conn in conns:
+        await conn.close()
+
+
+async def init_engines() -> None:
+    """
+    Create the reader, writer and replica engines, with pool_size connections opened each,
+    and start the health checks of the replicas.
+    Meant to run once per worker at startup, so that the first requests do not pay
+    for the connection setup.
+    """
+    global _health_check_task
+    await asyncio.gather(_warm_up(_get_engine_reader()), _warm_up(_get_engine_writer()))
+
+    if (replicas := _get_replica_set()) is None or _health_check_task is not None:
+        return
+    # A replica down at startup is left to its health check
+    await asyncio.gather(
+        *(_warm_up(e) for e in replicas.engines.values()), return_exceptions=True
+    )
+    await replicas.check_health()
+    _health_check_task = asyncio.create_task(
+        replicas.run_health_checks(mysql_config.replica_health_check_interval)
+    )
+
+
+async def dispose_engines() -> None:
+    """
+    Close all the pooled connections of the engines, meant to run at shutdown.
+    """
+    global engine_reader, engine_writer, replica_set, _health_check_task
+    if _health_check_task is not None:
+        _health_check_task.cancel()
+        _health_check_task = None
+
+    engines = [engine_reader, engine_writer]
+    if replica_set is not None:
+        engines.extend(replica_set.engines.values())
+    for engine in engines:
+        if engine is not None:
+            await engine.dispose()
+    engine_reader = None
+    engine_writer = None
+    replica_set = None
+
+
+def get_pool_stats() -> dict[str, PoolStats]:
+    """
+    Pool statistics of this process, keyed by engine ("reader", "writer", "replica:<host>").
+    """
+    engines: dict[str, AsyncEngine | None] = dict(
+        reader=engine_reader, writer=engine_writer
+    )
+    if replica_set is not None:
+        engines.update(replica_set.engines)
+    return collect_pool_stats(engines)
+
+
 GenericTableModel = TypeVar("GenericTableModel", bound=BaseTableModel)
 
 
+def _estimate_sql_bytes(value: Any) -> int:
+    """
+    Upper bound of the size of a value rendered in SQL, escaping at most doubles it.
+    """
+    if isinstance(value, str):
+        return 2 * len(value.encode()) + 3
+    if isinstance(value, bytes):
+        return 2 * len(value) + 3
+    return 32
+
+
+def _chunk_by_size(
+    rows: list[dict[str, Any]], max_bytes: int = INSERT_CHUNK_MAX_BYTES
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    Consecutive chunks of rows whose estimated size stays under max_bytes,
+    a row bigger than it makes a chunk on its own.
+    """
+    chunk: list[dict[str, Any]] = list()
+    chunk_bytes = 0
+    for row in rows:
+        # Separators and parentheses of the row
+        row_bytes = sum(_estimate_sql_bytes(v) + 1 for v in row.values()) + 2
+        if chunk and chunk_bytes + row_bytes > max_bytes:
+            yield chunk
+            chunk, chunk_bytes = list(), 0
+        chunk.append(row)
+        chunk_bytes += row_bytes
+    if chunk:
+        yield chunk
+
+
+def _build_insert_query(table_name: str, cols: tuple[str, ...], or_ignore: bool) -> str:
+    """
+    Single row insert, named after its columns. Executed with many rows, the
+    driver rewrites it into one multi-row INSERT ... VALUES (...),(...).
+    """
+    return (
+        f"INSERT {"IGNORE" if or_ignore else ""} INTO {table_name}"
+        f" ({",".join(cols)}) VALUES ({",".join(f":{col}" for col in cols)})"
+    )
+
+
+def _build_upsert_query(
+    table_name: str, cols: tuple[str, ...], update_columns: tuple[str, ...]
+) -> str:
+    """
+    Single row upsert, see _build_insert_query. The existing row also sets
+    LAST_INSERT_ID, so that lastrowid is its id. VALUES(col) rather than a row
+    alias, which the driver would not rewrite into a multi-row statement.
+    """
+    updates = ["id = LAST_INSERT_ID(id)"]
+    updates.extend(f"{col} = VALUES({col})" for col in update_columns)
+    return (
+        _build_insert_query(table_name, cols, False)
+        + f" ON DUPLICATE KEY UPDATE {", ".join(updates)}"
+    )
+
+
+@lru_cache(maxsize=1024)
+def _text(query: str) -> TextClause:
+    # Queries built by the client are stable, parsing their bind params once is enough
+    return text(query)
+
+
 class AMysqlClient(ABC):
-    def __init__(self, logger: Logger | None = None) -> None:
+    # Key of the engine in the pool statistics
+    pool_name: str
+
+    def __init__(
+        self, logger: Logger | None = None, statement_timeout: float | None = None
+    ) -> None:
         self.logger = logger or base_logger
         self.engine: AsyncEngine | None = None
+        self.prepared_statements = False
+        self.cached = False
+        # Seconds, 0 for no limit, see deadline
+        self.statement_timeout = (
+            mysql_config.statement_timeout
+            if statement_timeout is None
+            else statement_timeout
+        )
 
     @abstractmethod
     def _connect(self) -> None:
@@ -66,20 +298,109 @@ class AMysqlClient(ABC):
         """
         pass
 
-    def _logging(self, query: str, args: dict | None, result: CursorResult) -> None:
+    def _pick_engine(self) -> tuple[str, AsyncEngine | None]:
+        """
+        The engine to check a connection out from, and its name in the pool statistics.
+        """
+        return self.pool_name, self.engine
+
+    @asynccontextmanager
+    async def _checkout(self, begin: bool = False) -> AsyncIterator[AsyncConnection]:
+        """
+        A connection from the pool of the engine, recording the checkout wait.
+        If begin, a transaction is commited on exit, rolled back if an exception is raised.
+        """
+        pool_name, engine = self._pick_engine()
+        if not engine:
+            raise AMySqlNoEngineError("Could not execute query, no engine yet.")
+        start = time.perf_counter()
+        try:
+            conn = await engine.connect()
+        except PoolTimeoutError:
+            record_checkout_timeout(pool_name)
+            raise AMySqlTimeoutError(
+                f"No connection of the {pool_name} pool available in time."
+            )
+        wait_s = time.perf_counter() - start
+        record_checkout(pool_name, wait_s)
+        # Attributed to the first statement of the connection
+        conn.info[CHECKOUT_WAIT_INFO_KEY] = wait_s
+
+        try:
+            if not begin:
+                yield conn
+                return
+            async with conn.begin():
+                yield conn
+        finally:
+            await conn.close()
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[AsyncConnection]:
+        """
+        The connection the statements are executed on.
+        """
+        async with self._checkout() as conn:
+            yield conn
+
+    @asynccontextmanager
+    async def _statement(
+        self, conn: AsyncConnection, query: str
+    ) -> AsyncIterator[StatementRun]:
+        """
+        The statement run within the block on conn, bounded by its timeout (see
+        deadline) and recorded in the telemetry. Yields the query to run, with its
+        server-side timeout hint, the block sets the rowcount of the run.
+
+        Raises
+        ------
+        AMySqlTimeoutError
+            If the statement did not end in time
+        """
+        timeout = statement_timeout(self.statement_timeout)
+        run = StatementRun(
+            query=query if timeout is None else with_max_execution_time(query, timeout)
+        )
+        # Read before the run: conn is not usable anymore once invalidated
+        pool_wait_s = conn.info.pop(CHECKOUT_WAIT_INFO_KEY, 0)
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(timeout):
+                yield run
+        except TimeoutError:
+            # Left in the middle of the statement, the connection is not reusable
+            await conn.invalidate()
+            self.logger.warning(f"query timed out after {timeout:.3f}s, {query}")
+            raise AMySqlTimeoutError(f"Query timed out after {timeout:.3f}s.")
+        except DBAPIError as e:
+            orig_args = getattr(e.orig, "args", None)
+            if not orig_args or orig_args[0] != MAX_EXECUTION_TIME_EXCEEDED_ERROR:
+                raise
+            self.logger.warning(f"query interrupted by the server, {query}")
+            raise AMySqlTimeoutError("Query interrupted by the server.")
+        finally:
+            record_statement(
+                query=query,
+                rows=run.rowcount,
+                elapsed_s=time.perf_counter() - start,
+                pool_wait_s=pool_wait_s,
+            )
+
+    def _logging(self, query: str, args: dict | None, rowcount: int) -> None:
+        if not self.logger.isEnabledFor(DEBUG):
+            return
         if args:
-            for key, value in args.items():
+            # Longest first, so that :p1 does not replace the start of :p10
+            for key in sorted(args, key=len, reverse=True):
+                value = args[key]
                 quoted = f"'{value}'" if isinstance(value, str) else str(value)
                 query = query.replace(f":{key}", quoted)
-        self.logger.debug(f"MysqlClient executed: {query} {result.rowcount=}")
-
-    def _get_uuid4(self) -> str:
-        return "id_" + str(uuid4()).replace("-", "_")
+        self.logger.debug(f"MysqlClient executed: {query} {rowcount=}")
 
     def update_args_get_uids_sql(
         self, args: dict[str, Any], ls_val: list[Any]
     ) -> list[str]:
-        uids = [self._get_uuid4() for _ in range(len(ls_val))]
+        uids = [param_name(i) for i in range(len(args), len(args) + len(ls_val))]
         args.update({uid: value for uid, value in zip(uids, ls_val)})
         return [f":{uid}" for uid in uids]
 
@@ -105,39 +426,251 @@ class AMysqlClient(ABC):
         tuple
             The args parameter to give to MysqlClient.execute
         """
-        conds = ["WHERE 1 = 1"]
-        args: dict[str, Any] = dict()
+        shape, values = cond_shape_and_values(
+            cond_null=cond_null,
+            cond_not_null=cond_not_null,
+            cond_in=cond_in,
+            cond_equal=cond_equal,
+            cond_non_equal=cond_non_equal,
+            cond_less_or_eq=cond_less_or_eq,
+            cond_greater_or_eq=cond_greater_or_eq,
+            cond_less=cond_less,
+            cond_greater=cond_greater,
+        )
+        condition = get_compiled_query(("cond", shape), lambda: render_cond(shape)[0])
+        return CondReturn(condition=condition, args=bind(values))
 
-        for col in cond_null:
-            conds.append(f"AND {col} IS NULL")
+    def _to_models(
+        self, table: Type[GenericTableModel], rows: list[dict[str, Any]]
+    ) -> list[GenericTableModel]:
+        if mysql_config.trusted_hydration:
+            return [table.from_db(r) for r in rows]
+        return [table(**r) for r in rows]
 
-        for col in cond_not_null:
-            conds.append(f"AND {col} IS NOT NULL")
+    def _keyset_values(self, order_by: str, after: tuple) -> list[Any]:
+        try:
+            return keyset_values(order_by, after)
+        except ValueError as e:
+            raise AMySqlWrongQueryError(str(e))
 
-        for col, ls_val in cond_in.items():
-            if len(ls_val) == 0:
-                # No values in the in -> no match
-                conds.append("AND 1 = 0")
-                continue
-            uids_sql = self.update_args_get_uids_sql(args=args, ls_val=ls_val)
-            conds.append(f"AND {col} IN (" + ",".join(uids_sql) + ")")
+    def _build_count_query(
+        self, table_name: str, select_col: list[str], shape: tuple
+    ) -> str:
+        cond, _ = render_cond(shape)
+        return f"SELECT COUNT({', '.join(select_col) if select_col else '*'}) AS ct FROM {table_name} {cond} ;"
 
-        symbols_colvalues = {
-            "=": cond_equal,
-            "<>": cond_non_equal,
-            "<=": cond_less_or_eq,
-            ">=": cond_greater_or_eq,
-            "<": cond_less,
-            ">": cond_greater,
-        }
+    def _build_aggregate_query(
+        self,
+        table: Type[BaseTableModel],
+        aggregates: dict[str, Aggregate],
+        group_by: list[str],
+        shape: tuple,
+    ) -> str:
+        cond, _ = render_cond(shape)
+        query_parts = [render_aggregate_select(table, aggregates, group_by), cond]
+        if group_by:
+            query_parts.append(f"GROUP BY {', '.join(group_by)}")
+        query_parts.append(";")
+        return " ".join(query_parts)
 
-        for symbol, colvalues in symbols_colvalues.items():
-            for col, val in colvalues.items():
-                uid = self._get_uuid4()
-                conds.append(f"AND {col} {symbol} :{uid}")
-                args[uid] = val
+    def _build_select_query(
+        self,
+        table_name: str,
+        columns: tuple[str, ...],
+        shape: tuple,
+        order_by: str,
+        ascending_order: bool,
+        paginated: bool,
+        keyset: bool = False,
+        for_update: bool = False,
+    ) -> str:
+        cond, nb_params = render_cond(shape)
+        query_parts = [
+            f"SELECT {', '.join(columns) if columns else '*'} FROM {table_name}",
+            cond,
+        ]
+        if keyset:
+            keyset_cond, nb_keyset_params = render_keyset(
+                order_by, ascending_order, nb_params
+            )
+            query_parts.append(keyset_cond)
+            nb_params += nb_keyset_params
+
+        if order_by:
+            query_parts.append(render_order_by(order_by, ascending_order))
 
-        return CondReturn(condition=" ".join(conds), args=args)
+        if paginated:
+            query_parts.append(f"LIMIT :{param_name(nb_params)}")
+            query_parts.append(f"OFFSET :{param_name(nb_params + 1)}")
+        if for_update:
+            query_parts.append("FOR UPDATE")
+        query_parts.append(";")
+        return " ".join(query_parts)
+
+    def _compile_select(
+        self,
+        table: Type[GenericTableModel],
+        cond_null: list[str],
+        cond_not_null: list[str],
+        cond_in: dict[str, list],
+        cond_equal: dict[str, Any],
+        cond_non_equal: dict[str, Any],
+        cond_less_or_eq: dict[str, Any],
+        cond_greater_or_eq: dict[str, Any],
+        cond_less: dict[str, Any],
+        cond_greater: dict[str, Any],
+        order_by: str,
+        ascending_order: bool,
+        limit: int,
+        offset: int,
+        columns: tuple[str, ...] = (),
+        after: tuple = (),
+        for_update: bool = False,
+    ) -> tuple[str, dict[str, Any]]:
+        """
+        Returns the query of a select, from the query cache, and its args.
+
+        Raises
+        ------
+        AMySqlWrongQueryError
+            If after does not have one value per order_by column
+        """
+        shape, values = cond_shape_and_values(
+            cond_null=cond_null,
+            cond_not_null=cond_not_null,
+            cond_in=cond_in,
+            cond_equal=cond_equal,
+            cond_non_equal=cond_non_equal,
+            cond_less_or_eq=cond_less_or_eq,
+            cond_greater_or_eq=cond_greater_or_eq,
+            cond_less=cond_less,
+            cond_greater=cond_greater,
+        )
+        keyset = bool(after)
+        if keyset:
+            values.extend(self._keyset_values(order_by, after))
+        paginated = limit > 0
+        if paginated:
+            values.extend((limit, offset))
+        query = get_compiled_query(
+            (
+                "select",
+                table.__tablename__,
+                columns,
+                shape,
+                order_by,
+                ascending_order,
+                paginated,
+                keyset,
+                for_update,
+            ),
+            self._build_select_query,
+            table.__tablename__,
+            columns,
+            shape,
+            order_by,
+            ascending_order,
+            paginated,
+            keyset,
+            for_update,
+        )
+        return query, bind(values)
+
+    def _build_join_query(
+        self,
+        table: Type[BaseTableModel],
+        alias: str,
+        joins: list[Join],
+        shape: tuple,
+        order_by: str,
+        ascending_order: bool,
+        paginated: bool,
+        keyset: bool = False,
+    ) -> str:
+        fetched = [(table, alias)] + [(j.table, j.alias) for j in joins if j.fetch]
+        select_cols = [f"{a}.{col}" for t, a in fetched for col in t.column_names()]
+
+        cond, nb_params = render_cond(shape)
+        query_parts = [
+            f"SELECT {', '.join(select_cols)} FROM {table.__tablename__} AS {alias}"
+        ]
+        for j in joins:
+            query_parts.append(
+                f"{'LEFT JOIN' if j.left else 'JOIN'} {j.table.__tablename__} AS {j.alias} ON {j.on}"
+            )
+        query_parts.append(cond)
+        if keyset:
+            keyset_cond, nb_keyset_params = render_keyset(
+                order_by, ascending_order, nb_params
+            )
+            query_parts.append(keyset_cond)
+            nb_params += nb_keyset_params
+
+        if order_by:
+            query_parts.append(render_order_by(order_by, ascending_order))
+
+        if paginated:
+            query_parts.append(f"LIMIT :{param_name(nb_params)}")
+            query_parts.append(f"OFFSET :{param_name(nb_params + 1)}")
+        query_parts.append(";")
+        return " ".join(query_parts)
+
+    def _build_update_query(
+        self, table_name: str, columns: tuple[str, ...], shape: tuple
+    ) -> str:
+        cond, nb_params = render_cond(shape)
+        set_parts = [
+            f"{col} = :{param_name(nb_params + i)}" for i, col in enumerate(columns)
+        ]
+        return f"UPDATE {table_name} SET {', '.join(set_parts)} {cond} ;"
+
+    def _build_delete_query(self, table_name: str, shape: tuple) -> str:
+        cond, _ = render_cond(shape)
+        return f"DELETE FROM {table_name} {cond} ;"
+
+    async def _execute_rows(
+        self, query: str, args: dict[str, Any] | None = None
+    ) -> Sequence[Row]:
+        """
+        Execute a SQL query and return the raw rows, without commiting (read only).
+
+        Raises
+        ------
+        AMySqlWrongQueryError
+            If query is wrong
+        AMySqlNoEngineError
+            If no database connection exists
+        AMySqlTimeoutError
+            If the query did not end in time
+        """
+        cache_key = None
+        if self.cached:
+            cache_key, cached_rows = get_cached_rows(query, args)
+            if cached_rows is not None:
+                return cached_rows
+
+        try:
+            async with (
+                self._connection() as conn,
+                self._statement(conn, query) as run,
+            ):
+                if self.prepared_statements:
+                    result_alchemy = await execute_prepared(conn, run.query, args)
+                else:
+                    result_alchemy = await conn.execute(_text(run.query), args or {})
+                rows = result_alchemy.fetchall()
+                run.rowcount = len(rows)
+        except ProgrammingError:
+            self.logger.warning(
+                f"error while executing query, {traceback.format_exc()}"
+            )
+            raise AMySqlWrongQueryError(f"{traceback.format_exc()}")
+
+        self._logging(query=query, args=args, rowcount=result_alchemy.rowcount)
+
+        if cache_key is not None:
+            store_rows(cache_key, rows)
+        return rows
 
     async def execute(
         self, query: str, args: dict[str, Any] | None = None
@@ -164,21 +697,7 @@ class AMysqlClient(ABC):
         AMySqlNoEngineError
             If no database connection exists
         """
-        if not self.engine:
-            raise AMySqlNoEngineError("Could not execute query, no engine yet.")
-
-        try:
-            async with self.engine.connect() as conn:
-                result_alchemy = await conn.execute(text(query), args or {})
-                rows = result_alchemy.fetchall()
-        except ProgrammingError:
-            self.logger.warning(
-                f"error while executing query, {traceback.format_exc()}"
-            )
-            raise AMySqlWrongQueryError(f"{traceback.format_exc()}")
-
-        self._logging(query=query, args=args, result=result_alchemy)
-
+        rows = await self._execute_rows(query=query, args=args)
         return [dict(r._mapping) for r in rows]
 
     async def count(
@@ -235,32 +754,384 @@ class AMysqlClient(ABC):
         AMySqlNoEngineError
             If no database connection exists
         """
-        query_parts = [
-            f"SELECT COUNT({', '.join(select_col) if select_col else '*'}) AS ct FROM {table.__tablename__}"
-        ]
-        cond_ret = self._generate_cond(
+        shape, values = cond_shape_and_values(
+            cond_null=cond_null,
+            cond_not_null=cond_not_null,
+            cond_in=cond_in,
+            cond_equal=cond_equal,
+            cond_non_equal=cond_non_equal,
+            cond_less_or_eq=cond_less_or_eq,
+            cond_greater_or_eq=cond_greater_or_eq,
+            cond_less=cond_less,
+            cond_greater=cond_greater,
+        )
+        query = get_compiled_query(
+            ("count", table.__tablename__, tuple(select_col), shape),
+            self._build_count_query,
+            table.__tablename__,
+            select_col,
+            shape,
+        )
+
+        res_mysql = await self.execute(query=query, args=bind(values))
+        res = res_mysql[0].get("ct", None)
+        return int(str(res)) if res else -1
+
+    async def aggregate(
+        self,
+        table: Type[GenericTableModel],
+        aggregates: dict[str, Aggregate],
+        group_by: list[str] = list(),
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, Any] = dict(),
+        cond_non_equal: dict[str, Any] = dict(),
+        cond_less_or_eq: dict[str, Any] = dict(),
+        cond_greater_or_eq: dict[str, Any] = dict(),
+        cond_less: dict[str, Any] = dict(),
+        cond_greater: dict[str, Any] = dict(),
+    ) -> list[dict[str, Any]]:
+        """
+        Execute a SELECT of aggregates (SUM, COUNT, MIN, MAX) with various conditions,
+        one row per group of the group_by columns.
+
+        Parameters
+        ----------
+        table : Type[T]
+            Table class to query from
+        aggregates : dict[str, Aggregate]
+            Aggregated columns, by their alias in the result rows
+        group_by : list[str], optional
+            Columns to group by, by default a single row for the whole table
+        cond_* : optional
+            Same as select
+
+        Returns
+        -------
+        list
+            One dict per group, of the group_by columns and the aliases of the aggregates.
+            A SUM of integers is a Decimal, and None if there is no row.
+
+        Raises
+        ------
+        AMySqlNoEngineError
+            If no database connection exists
+        AMySqlWrongQueryError
+            If query is wrong, or a column is not in the table
+        """
+        shape, values = cond_shape_and_values(
+            cond_null=cond_null,
+            cond_not_null=cond_not_null,
+            cond_in=cond_in,
+            cond_equal=cond_equal,
+            cond_non_equal=cond_non_equal,
+            cond_less_or_eq=cond_less_or_eq,
+            cond_greater_or_eq=cond_greater_or_eq,
+            cond_less=cond_less,
+            cond_greater=cond_greater,
+        )
+        try:
+            query = get_compiled_query(
+                (
+                    "aggregate",
+                    table.__tablename__,
+                    tuple(
+                        (a, agg.function, agg.column) for a, agg in aggregates.items()
+                    ),
+                    tuple(group_by),
+                    shape,
+                ),
+                self._build_aggregate_query,
+                table,
+                aggregates,
+                group_by,
+                shape,
+            )
+        except ValueError as e:
+            raise AMySqlWrongQueryError(str(e))
+
+        return await self.execute(query=query, args=bind(values))
+
+    @overload
+    async def select(
+        self,
+        table: Type[GenericTableModel],
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, Any] = dict(),
+        cond_non_equal: dict[str, Any] = dict(),
+        cond_less_or_eq: dict[str, Any] = dict(),
+        cond_greater_or_eq: dict[str, Any] = dict(),
+        cond_less: dict[str, Any] = dict(),
+        cond_greater: dict[str, Any] = dict(),
+        order_by: str = "",
+        ascending_order: bool = True,
+        limit: int = 0,
+        offset: int = 0,
+        after: tuple = (),
+        columns: None = None,
+    ) -> list[GenericTableModel]: ...
+
+    @overload
+    async def select(
+        self,
+        table: Type[GenericTableModel],
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, Any] = dict(),
+        cond_non_equal: dict[str, Any] = dict(),
+        cond_less_or_eq: dict[str, Any] = dict(),
+        cond_greater_or_eq: dict[str, Any] = dict(),
+        cond_less: dict[str, Any] = dict(),
+        cond_greater: dict[str, Any] = dict(),
+        order_by: str = "",
+        ascending_order: bool = True,
+        limit: int = 0,
+        offset: int = 0,
+        after: tuple = (),
+        *,
+        columns: list[str],
+    ) -> list[Any]: ...
+
+    async def select(
+        self,
+        table: Type[GenericTableModel],
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, Any] = dict(),
+        cond_non_equal: dict[str, Any] = dict(),
+        cond_less_or_eq: dict[str, Any] = dict(),
+        cond_greater_or_eq: dict[str, Any] = dict(),
+        cond_less: dict[str, Any] = dict(),
+        cond_greater: dict[str, Any] = dict(),
+        order_by: str = "",
+        ascending_order: bool = True,
+        limit: int = 0,
+        offset: int = 0,
+        after: tuple = (),
+        columns: list[str] | None = None,
+    ) -> list[GenericTableModel] | list[Any]:
+        """
+        Execute a SELECT query with various conditions.
+
+        Parameters
+        ----------
+        table : Type[T]
+            Table class to query from
+        cond_null : list[str], optional
+            Columns that must be NULL
+        cond_not_null : list[str], optional
+            Columns that must not be NULL
+        cond_in : dict[str, list], optional
+            Column values that must be in given list
+        cond_eq : dict[str, Any], optional
+            Column values that must equal given value
+        cond_neq : dict[str, Any], optional
+            Column values that must not equal given value
+        cond_leq : dict[str, Any], optional
+            Column values that must be less than or equal to given value
+        cond_geq : dict[str, Any], optional
+            Column values that must be greater than or equal to given value
+        cond_l : dict[str, Any], optional
+            Column values that must be less than given value
+        cond_g : dict[str, Any], optional
+            Column values that must be greater than given value
+        limit : int, optional
+            Maximum number of rows to return, 0 means all, by default 0
+        offset : int, optional
+            Number of rows to skip before returning results, 0 means no offset, by default 0
+        after : tuple, optional
+            Keyset pagination, only rows after these values of the order_by columns, by default all rows.
+            The order_by columns must identify a row (e.g. end with id), and be indexed to stay cheap on deep pages
+        columns : list[str] | None, optional
+            Only fetch these columns, the rows are then namedtuples of them instead of the actual class, by default all columns
+
+        Returns
+        -------
+        list
+            Query results as a list of actual class, or of namedtuples if columns is given
+
+        Raises
+        ------
+        AMySqlNoEngineError
+            If no database connection exists
+        AMySqlWrongQueryError
+            If query is wrong, a column is not in the table, or after does not match order_by
+        """
+        if columns is not None:
+            try:
+                table.projection_row_type(columns)
+            except ValueError as e:
+                raise AMySqlWrongQueryError(str(e))
+
+        query, args = self._compile_select(
+            table=table,
+            cond_null=cond_null,
+            cond_not_null=cond_not_null,
+            cond_in=cond_in,
+            cond_equal=cond_equal,
+            cond_non_equal=cond_non_equal,
+            cond_less_or_eq=cond_less_or_eq,
+            cond_greater_or_eq=cond_greater_or_eq,
+            cond_less=cond_less,
+            cond_greater=cond_greater,
+            order_by=order_by,
+            ascending_order=ascending_order,
+            limit=limit,
+            offset=offset,
+            columns=tuple(columns or ()),
+            after=after,
+        )
+        if columns is not None:
+            rows = await self._execute_rows(query=query, args=args)
+            return table.rows_from_db(columns, rows)
+
+        res_mysql = await self.execute(query=query, args=args)
+
+        return self._to_models(table, res_mysql)
+
+    @overload
+    def select_iter(
+        self,
+        table: Type[GenericTableModel],
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, Any] = dict(),
+        cond_non_equal: dict[str, Any] = dict(),
+        cond_less_or_eq: dict[str, Any] = dict(),
+        cond_greater_or_eq: dict[str, Any] = dict(),
+        cond_less: dict[str, Any] = dict(),
+        cond_greater: dict[str, Any] = dict(),
+        order_by: str = "",
+        ascending_order: bool = True,
+        batch_size: int = STREAM_BATCH_SIZE,
+        columns: None = None,
+    ) -> AsyncIterator[GenericTableModel]: ...
+
+    @overload
+    def select_iter(
+        self,
+        table: Type[GenericTableModel],
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, Any] = dict(),
+        cond_non_equal: dict[str, Any] = dict(),
+        cond_less_or_eq: dict[str, Any] = dict(),
+        cond_greater_or_eq: dict[str, Any] = dict(),
+        cond_less: dict[str, Any] = dict(),
+        cond_greater: dict[str, Any] = dict(),
+        order_by: str = "",
+        ascending_order: bool = True,
+        batch_size: int = STREAM_BATCH_SIZE,
+        *,
+        columns: list[str],
+    ) -> AsyncIterator[Any]: ...
+
+    async def select_iter(
+        self,
+        table: Type[GenericTableModel],
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, Any] = dict(),
+        cond_non_equal: dict[str, Any] = dict(),
+        cond_less_or_eq: dict[str, Any] = dict(),
+        cond_greater_or_eq: dict[str, Any] = dict(),
+        cond_less: dict[str, Any] = dict(),
+        cond_greater: dict[str, Any] = dict(),
+        order_by: str = "",
+        ascending_order: bool = True,
+        batch_size: int = STREAM_BATCH_SIZE,
+        columns: list[str] | None = None,
+    ) -> AsyncIterator[GenericTableModel] | AsyncIterator[Any]:
+        """
+        Same as select, but streams the rows with a server-side cursor instead of
+        fetching them all, only batch_size rows are held in memory at once.
+        The connection stays checked out until the iteration ends, no other statement
+        should be run on it meanwhile (e.g. within a writer transaction).
+
+        Parameters
+        ----------
+        table : Type[T]
+            Table class to query from
+        cond_* : optional
+            Same as select
+        order_by : str, optional
+            Column to order the rows by, by default no order
+        ascending_order : bool, optional
+            Order direction, by default True
+        batch_size : int, optional
+            Number of rows fetched from the server at once, by default STREAM_BATCH_SIZE
+        columns : list[str] | None, optional
+            Only fetch these columns, the rows are then namedtuples of them instead of the actual class, by default all columns
+
+        Yields
+        ------
+        GenericTableModel | namedtuple
+            Rows as actual class, or as namedtuples if columns is given
+
+        Raises
+        ------
+        AMySqlNoEngineError
+            If no database connection exists
+        AMySqlWrongQueryError
+            If query is wrong, or a column is not in the table
+        """
+        if columns is not None:
+            try:
+                table.projection_row_type(columns)
+            except ValueError as e:
+                raise AMySqlWrongQueryError(str(e))
+
+        query, args = self._compile_select(
+            table=table,
+            cond_null=cond_null,
+            cond_not_null=cond_not_null,
+            cond_in=cond_in,
             cond_equal=cond_equal,
-            cond_greater=cond_greater,
+            cond_non_equal=cond_non_equal,
+            cond_less_or_eq=cond_less_or_eq,
             cond_greater_or_eq=cond_greater_or_eq,
-            cond_in=cond_in,
             cond_less=cond_less,
-            cond_less_or_eq=cond_less_or_eq,
-            cond_non_equal=cond_non_equal,
-            cond_not_null=cond_not_null,
-            cond_null=cond_null,
+            cond_greater=cond_greater,
+            order_by=order_by,
+            ascending_order=ascending_order,
+            limit=0,
+            offset=0,
+            columns=tuple(columns or ()),
         )
-        cond, args = cond_ret.condition, cond_ret.args
-
-        query_parts.append(cond)
-        query_parts.append(";")
 
-        res_mysql = await self.execute(query=" ".join(query_parts), args=args)
-        res = res_mysql[0].get("ct", None)
-        return int(str(res)) if res else -1
+        async with self._connection() as conn:
+            try:
+                result_alchemy = await conn.stream(_text(query), args)
+            except ProgrammingError:
+                self.logger.warning(
+                    f"error while executing query, {traceback.format_exc()}"
+                )
+                raise AMySqlWrongQueryError(f"{traceback.format_exc()}")
+            self._logging(query=query, args=args, rowcount=-1)
+
+            async for partition in result_alchemy.partitions(batch_size):
+                if columns is not None:
+                    for row in table.rows_from_db(columns, partition):
+                        yield row
+                else:
+                    for model in self._to_models(
+                        table, [dict(r._mapping) for r in partition]
+                    ):
+                        yield model
 
-    async def select(
+    async def select_join(
         self,
-        table: Type[GenericTableModel],
+        table: Type[BaseTableModel],
+        alias: str,
+        joins: list[Join],
         cond_null: list[str] = list(),
         cond_not_null: list[str] = list(),
         cond_in: dict[str, list] = dict(),
@@ -274,79 +1145,115 @@ class AMysqlClient(ABC):
         ascending_order: bool = True,
         limit: int = 0,
         offset: int = 0,
-    ) -> list[GenericTableModel]:
+        after: tuple = (),
+    ) -> list[tuple[Any, ...]]:
         """
-        Execute a SELECT query with various conditions.
+        Execute a single SELECT query joining tables, and hydrate each row into the models of the fetched tables.
+        Within a call, rows of a table sharing the same id are hydrated once and returned as the same object.
 
         Parameters
         ----------
         table : Type[T]
-            Table class to query from
-        select_col : list[str], optional
-            List of columns to select, by default all columns. Note that this should not be used with a SqlModel expected return.
-        cond_null : list[str], optional
-            Columns that must be NULL
-        cond_not_null : list[str], optional
-            Columns that must not be NULL
-        cond_in : dict[str, list], optional
-            Column values that must be in given list
-        cond_eq : dict[str, Any], optional
-            Column values that must equal given value
-        cond_neq : dict[str, Any], optional
-            Column values that must not equal given value
-        cond_leq : dict[str, Any], optional
-            Column values that must be less than or equal to given value
-        cond_geq : dict[str, Any], optional
-            Column values that must be greater than or equal to given value
-        cond_l : dict[str, Any], optional
-            Column values that must be less than given value
-        cond_g : dict[str, Any], optional
-            Column values that must be greater than given value
+            Table class to query from, always fetched
+        alias : str
+            Alias of table in the query
+        joins : list[Join]
+            Tables to join, in order
+        cond_* : optional
+            Same as select, columns must be prefixed by their table alias, e.g. "t.state"
+        order_by : str, optional
+            Columns to order by, prefixed by their table alias, by default no order
         limit : int, optional
             Maximum number of rows to return, 0 means all, by default 0
         offset : int, optional
             Number of rows to skip before returning results, 0 means no offset, by default 0
+        after : tuple, optional
+            Same as select
 
         Returns
         -------
         list
-            Query results as a list of actual class
+            One tuple per row, holding the model of table then of each fetched join (None if a left join did not match)
 
         Raises
         ------
         AMySqlNoEngineError
             If no database connection exists
         AMySqlWrongQueryError
-            If query is wrong
+            If query is wrong, or after does not match order_by
         """
-        query_parts = [f"SELECT * FROM {table.__tablename__}"]
-        cond_ret = self._generate_cond(
+        shape, values = cond_shape_and_values(
+            cond_null=cond_null,
+            cond_not_null=cond_not_null,
+            cond_in=cond_in,
             cond_equal=cond_equal,
-            cond_greater=cond_greater,
+            cond_non_equal=cond_non_equal,
+            cond_less_or_eq=cond_less_or_eq,
             cond_greater_or_eq=cond_greater_or_eq,
-            cond_in=cond_in,
             cond_less=cond_less,
-            cond_less_or_eq=cond_less_or_eq,
-            cond_non_equal=cond_non_equal,
-            cond_not_null=cond_not_null,
-            cond_null=cond_null,
+            cond_greater=cond_greater,
         )
-        cond, args = cond_ret.condition, cond_ret.args
-
-        query_parts.append(cond)
-
-        if order_by:
-            query_parts.append(
-                f"ORDER BY {order_by} {'ASC' if ascending_order else 'DESC'}"
-            )
-
-        if limit > 0:
-            query_parts.append(f"LIMIT {limit}")
-            query_parts.append(f"OFFSET {offset}")
-        query_parts.append(";")
-        res_mysql = await self.execute(query=" ".join(query_parts), args=args)
-
-        return [table(**r) for r in res_mysql]
+        keyset = bool(after)
+        if keyset:
+            values.extend(self._keyset_values(order_by, after))
+        paginated = limit > 0
+        if paginated:
+            values.extend((limit, offset))
+        query = get_compiled_query(
+            (
+                "join",
+                table.__tablename__,
+                alias,
+                tuple(
+                    (j.table.__tablename__, j.alias, j.on, j.left, j.fetch)
+                    for j in joins
+                ),
+                shape,
+                order_by,
+                ascending_order,
+                paginated,
+                keyset,
+            ),
+            self._build_join_query,
+            table,
+            alias,
+            joins,
+            shape,
+            order_by,
+            ascending_order,
+            paginated,
+            keyset,
+        )
+        rows = await self._execute_rows(query=query, args=bind(values))
+
+        # (table, columns, start of its columns in the row, position of its id)
+        slices: list[tuple[Type[BaseTableModel], tuple[str, ...], int, int]] = list()
+        start = 0
+        for t in [table] + [j.table for j in joins if j.fetch]:
+            columns = t.column_names()
+            slices.append((t, columns, start, start + columns.index("id")))
+            start += len(columns)
+
+        identity_maps: list[dict[int, BaseTableModel]] = [dict() for _ in slices]
+        result: list[tuple[Any, ...]] = list()
+        for row in rows:
+            models: list[BaseTableModel | None] = list()
+            for (t, columns, start, id_index), identity_map in zip(
+                slices, identity_maps
+            ):
+                id = row[id_index]
+                if id is None:
+                    # No match for a left join
+                    models.append(None)
+                    continue
+                model = identity_map.get(id)
+                if model is None:
+                    model = identity_map[id] = self._to_models(
+                        t, [dict(zip(columns, row[start : start + len(columns)]))]
+                    )[0]
+                models.append(model)
+            result.append(tuple(models))
+        return result
 
     async def select_by_id(
         self,
@@ -400,41 +1307,122 @@ class AMysqlClient(ABC):
 
 
 class AMysqlClientReader(AMysqlClient):
-    def __init__(self, logger: Logger | None = None) -> None:
-        super().__init__(logger)
+    pool_name = "reader"
+
+    def __init__(
+        self,
+        logger: Logger | None = None,
+        prepared_statements: bool = False,
+        cached: bool = False,
+        statement_timeout: float | None = None,
+    ) -> None:
+        super().__init__(logger, statement_timeout)
+        # Meant for the hot statements, only effective if enabled in the config
+        self.prepared_statements = (
+            prepared_statements and mysql_config.prepared_statements
+        )
+        # Meant for the tables only written through AMysqlClientWriter, as other
+        # writes are only seen once the entries expire. Only effective if enabled
+        # in the config, select_iter is never cached.
+        self.cached = cached and mysql_config.result_cache
         self._connect()
 
     def _connect(self) -> None:
         self.engine = _get_engine_reader()
+        self.replica_set = _get_replica_set()
+
+    def _pick_engine(self) -> tuple[str, AsyncEngine | None]:
+        """
+        A healthy replica, unless there is none or the reads are pinned to the primary.
+        """
+        if self.replica_set is not None and not is_pinned_to_primary():
+            if (replica := self.replica_set.choose()) is not None:
+                return replica
+        return self.pool_name, self.engine
 
     async def check_alive(self) -> None:
-        try:
-            try:
-                check_alive_res = await self.execute("select 1;")
-            except Exception:
-                check_alive_res = None
-            if check_alive_res is None:
-                self._connect()
-            self.logger.info("AMysqlClientReader is alive.")
-        except Exception:
+        """
+        Health check of the replicas, then of the primary.
+        Replicas failing it stop receiving reads until they pass it again.
+
+        Raises
+        ------
+        AMySqlNoEngineError
+            If the primary is not reachable
+        """
+        if self.replica_set is not None:
+            await self.replica_set.check_health()
+        if not self.engine or not await is_healthy(self.engine):
             self.logger.critical("ERROR: Lost connection to Database.")
             raise AMySqlNoEngineError("ERROR: Lost connection to Database.")
+        self.logger.info("AMysqlClientReader is alive.")
 
 
 class AMysqlClientWriter(AMysqlClient):
-    def __init__(self, logger: Logger | None = None) -> None:
-        super().__init__(logger)
+    pool_name = "writer"
+
+    def __init__(
+        self, logger: Logger | None = None, statement_timeout: float | None = None
+    ) -> None:
+        super().__init__(logger, statement_timeout)
+        # Connection of the transaction in progress, if any
+        self._transaction_conn: AsyncConnection | None = None
+        # Tables written by the transaction in progress, their cached results are
+        # invalidated once it ends
+        self._written_tables: set[str] = set()
         self._connect()
 
     def _connect(self) -> None:
         self.engine = _get_engine_writer()
 
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[AsyncConnection]:
+        """
+        The connection of the transaction in progress, else a new one commiting on exit.
+        """
+        if self._transaction_conn is not None:
+            yield self._transaction_conn
+            return
+        pin_reads_to_primary()
+        async with self._checkout(begin=True) as conn:
+            yield conn
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Self]:
+        """
+        Run all the statements of the writer on a single connection and transaction,
+        commited once on exit, rolled back if an exception is raised.
+        A nested transaction joins the outer one.
+        A writer should not be shared by concurrent tasks during a transaction.
+
+        Raises
+        ------
+        AMySqlNoEngineError
+            If no database connection exists
+        """
+        if self._transaction_conn is not None:
+            yield self
+            return
+        pin_reads_to_primary()
+        self._written_tables = set()
+        try:
+            async with self._checkout(begin=True) as conn:
+                self._transaction_conn = conn
+                try:
+                    yield self
+                finally:
+                    self._transaction_conn = None
+        finally:
+            # Once commited, so that a concurrent read can not cache the former rows
+            bump_table_versions(self._written_tables)
+
     @overload
     async def execute(
         self,
         query: str,
         args: dict[str, Any] | None,
         insertion: Literal[True],
+        affected_rows: Literal[False] = False,
     ) -> int: ...
 
     @overload
@@ -443,6 +1431,17 @@ class AMysqlClientWriter(AMysqlClient):
         query: str,
         args: dict[str, Any] | None = None,
         insertion: Literal[False] = False,
+        *,
+        affected_rows: Literal[True],
+    ) -> int: ...
+
+    @overload
+    async def execute(
+        self,
+        query: str,
+        args: dict[str, Any] | None = None,
+        insertion: Literal[False] = False,
+        affected_rows: Literal[False] = False,
     ) -> list[dict[str, Any]]: ...
 
     async def execute(
@@ -450,9 +1449,11 @@ class AMysqlClientWriter(AMysqlClient):
         query: str,
         args: dict[str, Any] | None = None,
         insertion: bool = False,
+        affected_rows: bool = False,
     ) -> list[dict[str, Any]] | int:
         """
         Opens a transaction, execute a SQL query, commit and return the results.
+        Within writer.transaction(), runs in it and the commit happens at its end.
 
         Parameters
         ----------
@@ -460,11 +1461,17 @@ class AMysqlClientWriter(AMysqlClient):
             SQL query to execute
         args : tuple | dict | None, optional
             Parameters to pass to the query, by default None
+        insertion : bool, optional
+            Return the first id inserted instead, by default False
+        affected_rows : bool, optional
+            Return the number of rows matched by the statement instead, by default False
 
         Returns
         -------
         list
             Results of the query execution
+        int
+            The first id inserted, or the number of affected rows
 
         Raises
         ------
@@ -472,16 +1479,22 @@ class AMysqlClientWriter(AMysqlClient):
             If query is wrong
         AMySqlNoEngineError
             If no database connection exists
+        AMySqlTimeoutError
+            If the query did not end in time
         """
-        if not self.engine:
-            raise AMySqlNoEngineError("Could not execute query, no engine yet.")
-
         result_alchemy = None
         try:
-            async with self.engine.begin() as conn:
-                result_alchemy = await conn.execute(text(query), args or {})
+            async with (
+                self._connection() as conn,
+                self._statement(conn, query) as run,
+            ):
+                result_alchemy = await conn.execute(_text(run.query), args or {})
+                run.rowcount = result_alchemy.rowcount
                 if insertion:
                     return result_alchemy.lastrowid
+                elif affected_rows:
+                    # The mysql dialects connect with CLIENT_FOUND_ROWS: matched rows, even unchanged
+                    return result_alchemy.rowcount
                 else:
                     if result_alchemy.returns_rows:
                         rows = result_alchemy.fetchall()
@@ -499,8 +1512,66 @@ class AMysqlClientWriter(AMysqlClient):
                 raise AMySqlDuplicateError("Resource already exists")
             raise
         finally:
+            if tables := written_tables(query):
+                if self._transaction_conn is None:
+                    bump_table_versions(tables)
+                else:
+                    self._written_tables.update(tables)
+            if result_alchemy:
+                self._logging(query=query, args=args, rowcount=result_alchemy.rowcount)
+
+    async def _execute_many(self, query: str, args: list[dict[str, Any]]) -> int:
+        """
+        Execute an INSERT once per args, that the driver sends as a single multi-row
+        statement, see INSERT_CHUNK_MAX_BYTES.
+
+        Returns
+        -------
+        int
+            The first id inserted
+
+        Raises
+        ------
+        AMySqlWrongQueryError
+            If query is wrong
+        AMySqlDuplicateError
+            If a row already exists
+        AMySqlNoEngineError
+            If no database connection exists
+        AMySqlTimeoutError
+            If the query did not end in time
+        """
+        result_alchemy = None
+        try:
+            async with (
+                self._connection() as conn,
+                self._statement(conn, query) as run,
+            ):
+                result_alchemy = await conn.execute(_text(run.query), args)
+                run.rowcount = result_alchemy.rowcount
+                return result_alchemy.lastrowid
+        except ProgrammingError:
+            self.logger.warning(
+                f"error while executing query, {traceback.format_exc()}"
+            )
+            raise AMySqlWrongQueryError(f"{traceback.format_exc()}")
+        except IntegrityError as e:
+            # MySQL duplicate key error code
+            if getattr(e.orig, "args", None) and e.orig.args[0] == 1062:  # type:ignore
+                raise AMySqlDuplicateError("Resource already exists")
+            raise
+        finally:
+            if tables := written_tables(query):
+                if self._transaction_conn is None:
+                    bump_table_versions(tables)
+                else:
+                    self._written_tables.update(tables)
             if result_alchemy:
-                self._logging(query=query, args=args, result=result_alchemy)
+                self._logging(
+                    query=f"{query} x{len(args)}",
+                    args=args[0],
+                    rowcount=result_alchemy.rowcount,
+                )
 
     async def insert_one(
         self,
@@ -566,32 +1637,113 @@ class AMysqlClientWriter(AMysqlClient):
             e.model_dump(exclude={"createdAt", "updatedAt", "id"}) for e in to_insert
         ]
 
-        cols = list(to_insert_dict[0].keys())
-        query_parts = [
-            f"INSERT {"IGNORE" if or_ignore else ""} INTO {to_insert[0].__tablename__}"
-        ]
-        query_parts.append(f"({",".join(cols)})")
-        query_parts.append("VALUES")
+        table_name = to_insert[0].__tablename__
+        cols = tuple(to_insert_dict[0].keys())
+        if any(tuple(row.keys()) != cols for row in to_insert_dict):
+            raise AMySqlColumnInconsistencyError(
+                f"Rows to insert in {table_name} have different columns"
+            )
+        query = get_compiled_query(
+            ("insert", table_name, cols, or_ignore),
+            _build_insert_query,
+            table_name,
+            cols,
+            or_ignore,
+        )
+
+        # All the chunks or none
+        async with self.transaction():
+            items = iter(to_insert)
+            for chunk in _chunk_by_size(to_insert_dict):
+                # The ids of a multi-row insert are consecutive
+                first_id_inserted = await self._execute_many(query=query, args=chunk)
+                for offset in range(len(chunk)):
+                    next(items).id = first_id_inserted + offset
+
+    def _compile_upsert(
+        self, to_upsert: BaseTableModel, update_columns: list[str]
+    ) -> tuple[str, dict[str, Any]]:
+        """
+        Raises
+        ------
+        AMySqlColumnInconsistencyError
+            If an update column is not a column of the row
+        """
+        row = to_upsert.model_dump(exclude={"createdAt", "updatedAt", "id"})
+        table_name = to_upsert.__tablename__
+        cols = tuple(row.keys())
+        if unknown_columns := set(update_columns) - set(cols):
+            raise AMySqlColumnInconsistencyError(
+                f"Cannot update {unknown_columns} on duplicate, not columns of {table_name}"
+            )
+        query = get_compiled_query(
+            ("upsert", table_name, cols, tuple(update_columns)),
+            _build_upsert_query,
+            table_name,
+            cols,
+            tuple(update_columns),
+        )
+        return query, row
 
-        insert_part = list()
-        args: dict[str, Any] = dict()
-        for row in to_insert_dict:
-            values = [row[col] for col in cols]
-            uids_sql = self.update_args_get_uids_sql(args=args, ls_val=values)
-            insert_part.append(f"({",".join(uids_sql)})")
-        query_parts.append(",".join(insert_part))
+    async def upsert_one(
+        self, to_upsert: BaseTableModel, update_columns: list[str] = list()
+    ) -> None:
+        """
+        Insert a row or, if it collides with an existing row on a unique key,
+        update update_columns of the existing row instead, in a single statement.
+        Inline sets the id, of the inserted or existing row.
 
-        query_parts.append(";")
+        Parameters
+        ----------
+        to_upsert : T
+            Item to insert
+        update_columns : list[str], optional
+            Columns of the existing row set to the ones of to_upsert, by default none
 
-        first_id_inserted = await self.execute(
-            query=" ".join(query_parts),
-            args=args,
-            insertion=True,
-        )
-        id_current = first_id_inserted
-        for item in to_insert:
-            item.id = id_current
-            id_current += 1
+        Raises
+        ------
+        AMySqlColumnInconsistencyError
+            If an update column is not a column of the row
+        AMySqlNoEngineError
+            If no database connection exists
+        AMySqlWrongQueryError
+            If query is wrong
+        """
+        query, row = self._compile_upsert(to_upsert, update_columns)
+        to_upsert.id = await self.execute(query=query, args=row, insertion=True)
+
+    async def upsert(
+        self, to_upsert: list[GenericTableModel], update_columns: list[str] = list()
+    ) -> None:
+        """
+        upsert_one for multiple rows, chunked like insert, in a single transaction.
+        The ids are not set: MySQL only reports one id per statement.
+
+        Raises
+        ------
+        AMySqlColumnInconsistencyError
+            If an update column is not a column of the rows, or if multiple
+            rows have individually different columns
+        AMySqlNoEngineError
+            If no database connection exists
+        AMySqlWrongQueryError
+            If query is wrong
+        """
+        if not to_upsert:
+            return
+
+        query, first_row = self._compile_upsert(to_upsert[0], update_columns)
+        rows = [
+            e.model_dump(exclude={"createdAt", "updatedAt", "id"}) for e in to_upsert
+        ]
+        if any(row.keys() != first_row.keys() for row in rows):
+            raise AMySqlColumnInconsistencyError(
+                f"Rows to upsert in {to_upsert[0].__tablename__} have different columns"
+            )
+
+        async with self.transaction():
+            for chunk in _chunk_by_size(rows):
+                await self._execute_many(query=query, args=chunk)
 
     async def delete(
         self,
@@ -608,6 +1760,7 @@ class AMysqlClientWriter(AMysqlClient):
     ) -> list[GenericTableModel]:
         """
         Delete rows from a database table based on conditions and returns them.
+        The rows are read with SELECT ... FOR UPDATE and deleted by chunks of ids, in a single transaction.
 
         Parameters
         ----------
@@ -644,32 +1797,54 @@ class AMysqlClientWriter(AMysqlClient):
         AMySqlWrongQueryError
             If query is wrong
         """
-        res_mysql = await self.select(
+        query, args = self._compile_select(
             table=table,
+            cond_null=cond_null,
+            cond_not_null=cond_not_null,
+            cond_in=cond_in,
             cond_equal=cond_equal,
-            cond_greater=cond_greater,
+            cond_non_equal=cond_non_equal,
+            cond_less_or_eq=cond_less_or_eq,
             cond_greater_or_eq=cond_greater_or_eq,
-            cond_in=cond_in,
             cond_less=cond_less,
-            cond_less_or_eq=cond_less_or_eq,
-            cond_non_equal=cond_non_equal,
-            cond_not_null=cond_not_null,
-            cond_null=cond_null,
+            cond_greater=cond_greater,
+            order_by="",
+            ascending_order=True,
+            limit=0,
+            offset=0,
+            for_update=True,
         )
-        ids_to_delete_ls: list[int] = [r.id for r in res_mysql]
 
-        if not ids_to_delete_ls:
-            self.logger.info("nothing to update")
-            return list()
-
-        query_parts = [f"DELETE FROM {table.__tablename__}"]
+        async with self.transaction():
+            # Locked until the commit, the rows returned are the rows deleted
+            res_mysql = self._to_models(
+                table, await self.execute(query=query, args=args)
+            )
 
-        args: dict[str, Any] = dict()
-        uids_sql = self.update_args_get_uids_sql(args=args, ls_val=ids_to_delete_ls)
-        query_parts.append(f"WHERE id IN ({", ".join(uids_sql)})")
-        query_parts.append(";")
+            if not res_mysql:
+                self.logger.info("nothing to delete")
+                return list()
+
+            for ids_chunk in batched([r.id for r in res_mysql], DELETE_CHUNK_SIZE):
+                shape, values = cond_shape_and_values(
+                    cond_null=list(),
+                    cond_not_null=list(),
+                    cond_in=dict(id=list(ids_chunk)),
+                    cond_equal=dict(),
+                    cond_non_equal=dict(),
+                    cond_less_or_eq=dict(),
+                    cond_greater_or_eq=dict(),
+                    cond_less=dict(),
+                    cond_greater=dict(),
+                )
+                query = get_compiled_query(
+                    ("delete", table.__tablename__, shape),
+                    self._build_delete_query,
+                    table.__tablename__,
+                    shape,
+                )
+                await self.execute(query=query, args=bind(values))
 
-        await self.execute(query=" ".join(query_parts), args=args)
         return res_mysql
 
     async def delete_by_id(
@@ -734,27 +1909,89 @@ class AMysqlClientWriter(AMysqlClient):
         if not col_to_value_map:
             return
 
-        if not await self.id_exists(table=table, id=id):
+        if not await self.update_where(
+            table=table, col_to_value_map=col_to_value_map, cond_equal={"id": id}
+        ):
             raise AMySqlIdNotFoundError(
                 f"{id=} not found during update in table {table.__tablename__}"
             )
 
-        columns: list[str] = list()
-        values: list[Any] = list()
+    async def update_where(
+        self,
+        table: Type[GenericTableModel],
+        col_to_value_map: dict[str, Any],
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, Any] = dict(),
+        cond_non_equal: dict[str, Any] = dict(),
+        cond_less_or_eq: dict[str, Any] = dict(),
+        cond_greater_or_eq: dict[str, Any] = dict(),
+        cond_less: dict[str, Any] = dict(),
+        cond_greater: dict[str, Any] = dict(),
+    ) -> int:
+        """
+        Update the rows of a database table matching the conditions, in a single statement.
+
+        Parameters
+        ----------
+        table : Type[T]
+            Table class to update
+        col_to_value_map : dict[str, Any]
+            The dictionnary mapping the column names to the value to update
+        cond_null : list[str], optional
+            Columns that must be NULL
+        cond_not_null : list[str], optional
+            Columns that must not be NULL
+        cond_in : dict[str, list], optional
+            Column values that must be in given list
+        cond_eq : dict[str, Any], optional
+            Column values that must equal given value
+        cond_neq : dict[str, Any], optional
+            Column values that must not equal given value
+        cond_leq : dict[str, Any], optional
+            Column values that must be less than or equal to given value
+        cond_geq : dict[str, Any], optional
+            Column values that must be greater than or equal to given value
+        cond_l : dict[str, Any], optional
+            Column values that must be less than given value
+        cond_g : dict[str, Any], optional
+            Column values that must be greater than given value
 
-        for col, val in col_to_value_map.items():
-            columns.append(col)
-            values.append(val)
+        Returns
+        -------
+        int
+            The number of rows matching the conditions, updated or already holding the values
 
-        args: dict[str, Any] = dict()
-        uuids_values = self.update_args_get_uids_sql(args=args, ls_val=values)
+        Raises
+        ------
+        AMySqlNoEngineError
+            If no database connection exists
+        AMySqlWrongQueryError
+            If query is wrong
+        """
+        if not col_to_value_map:
+            return 0
 
-        await self.execute(
-            query=f"""
-            UPDATE {table.__tablename__}
-            SET {",".join([f"{c}={u}" for c,u in zip(columns,uuids_values)])}
-            WHERE 
-                id={id}
-        """,
-            args=args,
+        shape, values = cond_shape_and_values(
+            cond_null=cond_null,
+            cond_not_null=cond_not_null,
+            cond_in=cond_in,
+            cond_equal=cond_equal,
+            cond_non_equal=cond_non_equal,
+            cond_less_or_eq=cond_less_or_eq,
+            cond_greater_or_eq=cond_greater_or_eq,
+            cond_less=cond_less,
+            cond_greater=cond_greater,
         )
+        columns = tuple(col_to_value_map)
+        query = get_compiled_query(
+            ("update", table.__tablename__, columns, shape),
+            self._build_update_query,
+            table.__tablename__,
+            columns,
+            shape,
+        )
+        values.extend(col_to_value_map.values())
+
+        return await self.execute(query=query, args=bind(values), affected_rows=True)
@@ -0,0 +1,83 @@
+"""
+Deadlines of the AMysqlClient statements.
+
+A statement is bounded by the statement timeout of its client and by the
+deadline of the current context (e.g. set by an endpoint), whichever is sooner.
+It is enforced client-side with asyncio.timeout, the connection then being
+invalidated as it is left in the middle of the statement, and server-side for
+the SELECTs with the MAX_EXECUTION_TIME optimizer hint.
+"""
+
+import math
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Iterator
+
+from .exceptions import AMySqlTimeoutError
+
+# MySQL error code of "maximum statement execution time exceeded"
+MAX_EXECUTION_TIME_EXCEEDED_ERROR = 3024
+
+_SELECT = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+
+# time.monotonic() by which the statements of the context must be done
+_deadline: ContextVar[float | None] = ContextVar("query_deadline", default=None)
+
+
+@contextmanager
+def query_deadline(seconds: float) -> Iterator[None]:
+    """
+    The statements run within the block must be done in seconds from now.
+    A nested deadline can only make it sooner.
+    """
+    previous = _deadline.get()
+    deadline = time.monotonic() + seconds
+    if previous is not None:
+        deadline = min(deadline, previous)
+    _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        # Not a token reset, the block may end in another context (e.g. a dependency)
+        _deadline.set(previous)
+
+
+def statement_timeout(timeout: float) -> float | None:
+    """
+    Seconds a statement is given, None if unbounded.
+
+    Parameters
+    ----------
+    timeout : float
+        Statement timeout of the client, 0 for none
+
+    Raises
+    ------
+    AMySqlTimeoutError
+        If the deadline of the context is already over
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return timeout or None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise AMySqlTimeoutError("Query deadline exceeded before the statement.")
+    return min(timeout, remaining) if timeout else remaining
+
+
+@lru_cache(maxsize=1024)
+def _hint_max_execution_time(query: str, timeout_s: int) -> str:
+    return _SELECT.sub(
+        f"SELECT /*+ MAX_EXECUTION_TIME({timeout_s * 1000}) */", query, count=1
+    )
+
+
+def with_max_execution_time(query: str, timeout: float) -> str:
+    """
+    The query with the server-side timeout hint, if a SELECT. The timeout is
+    rounded up to the second, for the hinted queries to stay few and cacheable.
+    """
+    return _hint_max_execution_time(query, math.ceil(timeout))
@@ -36,3 +36,8 @@ class AMySqlIdNotFoundError(Exception):
 class AMySqlDuplicateError(Exception):
     def __init__(self, detail: str | None = None) -> None:
         super().__init__(detail)
+
+
+class AMySqlTimeoutError(Exception):
+    def __init__(self, detail: str | None = None) -> None:
+        super().__init__(detail)
@@ -1,6 +1,25 @@
+from typing import Type
+
 from pydantic import BaseModel
+from src.models.database import BaseTableModel
 
 
 class CondReturn(BaseModel):
     condition: str
     args: dict[str, object]
+
+
+class Join(BaseModel):
+    """
+    A table joined in AMysqlClient.select_join.
+
+    on is the raw join condition between the aliases, e.g. "u.id = t.creator_id".
+    left makes it a LEFT JOIN, the rows without a match then hold None for this table.
+    fetch=False only uses the table to join or filter, its columns are not returned.
+    """
+
+    table: Type[BaseTableModel]
+    alias: str
+    on: str
+    left: bool = False
+    fetch: bool = True
@@ -0,0 +1,76 @@
+"""
+Statistics of the connection pools of AMysqlClient engines.
+
+The checkout wait is measured around the connection acquisition of the
+client, it includes the time to open a new connection when the pool has
+none idle.
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+
+@dataclass
+class _CheckoutCounters:
+    checkouts: int = 0
+    timeouts: int = 0
+    total_wait_s: float = 0
+    max_wait_s: float = 0
+
+
+@dataclass
+class PoolStats:
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+_counters: dict[str, _CheckoutCounters] = dict()
+
+
+def record_checkout(pool_name: str, wait_s: float) -> None:
+    counters = _counters.setdefault(pool_name, _CheckoutCounters())
+    counters.checkouts += 1
+    counters.total_wait_s += wait_s
+    counters.max_wait_s = max(counters.max_wait_s, wait_s)
+
+
+def record_checkout_timeout(pool_name: str) -> None:
+    _counters.setdefault(pool_name, _CheckoutCounters()).timeouts += 1
+
+
+def collect_pool_stats(
+    engines: dict[str, AsyncEngine | None],
+) -> dict[str, PoolStats]:
+    """
+    Current state and checkout counters of this process, for each created engine.
+    """
+    stats: dict[str, PoolStats] = dict()
+    for pool_name, engine in engines.items():
+        if engine is None or not isinstance(engine.pool, QueuePool):
+            continue
+        pool = engine.pool
+        counters = _counters.get(pool_name, _CheckoutCounters())
+        stats[pool_name] = PoolStats(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # Negative while the pool is not filled up to its size yet
+            overflow=max(pool.overflow(), 0),
+            checkouts=counters.checkouts,
+            timeouts=counters.timeouts,
+            avg_wait_ms=(
+                counters.total_wait_s / counters.checkouts * 1e3
+                if counters.checkouts
+                else 0
+            ),
+            max_wait_ms=counters.max_wait_s * 1e3,
+        )
+    return stats
@@ -0,0 +1,119 @@
+"""
+Server-side prepared statements for AMysqlClient.
+
+asyncmy only speaks the text protocol, so statements are prepared with SQL
+PREPARE and run with EXECUTE ... USING user variables. A statement is prepared
+once per pooled connection: the registry lives in the connection info, which
+SQLAlchemy clears whenever the connection is recycled or invalidated, so a
+fresh connection transparently prepares again.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from cachetools import LRUCache
+from sqlalchemy import CursorResult
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# MySQL error code of "Unknown prepared statement handler"
+UNKNOWN_STMT_HANDLER_ERROR = 1243
+# Keeps each connection well under the server max_prepared_stmt_count
+MAX_PREPARED_PER_CONNECTION = 64
+# Statements with counters, the least recently run ones are forgotten
+PREPARED_STATS_MAXSIZE = 1024
+
+_REGISTRY_INFO_KEY = "prepared_statements"
+_COUNTER_INFO_KEY = "prepared_statements_counter"
+_BIND_PARAM = re.compile(r"(?<![:\w]):(\w+)")
+
+
+@dataclass
+class PreparedStatementStats:
+    prepares: int = 0
+    executions: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.executions - self.prepares
+
+
+_stats: LRUCache[str, PreparedStatementStats] = LRUCache(maxsize=PREPARED_STATS_MAXSIZE)
+
+
+def get_prepared_statement_stats() -> dict[str, PreparedStatementStats]:
+    """
+    Per statement counters of this process, keyed by the prepared SQL,
+    for the PREPARED_STATS_MAXSIZE most recently run statements.
+    """
+    return dict(_stats)
+
+
+@lru_cache(maxsize=1024)
+def _to_positional(query: str) -> tuple[str, tuple[str, ...]]:
+    """
+    Turns a query with :name placeholders into a PREPARE-able one with ?.
+
+    Returns
+    -------
+    str
+        The query with ? placeholders
+    tuple
+        The placeholder names, in order
+    """
+    names = tuple(_BIND_PARAM.findall(query))
+    sql = _BIND_PARAM.sub("?", query).strip().removesuffix(";").strip()
+    return sql, names
+
+
+async def _prepare(conn: AsyncConnection, sql: str) -> str:
+    registry: dict[str, str] = conn.info.setdefault(_REGISTRY_INFO_KEY, dict())
+
+    if len(registry) >= MAX_PREPARED_PER_CONNECTION:
+        # Oldest prepared first, dicts keep insertion order
+        oldest_sql = next(iter(registry))
+        await conn.exec_driver_sql(f"DEALLOCATE PREPARE {registry.pop(oldest_sql)}")
+
+    counter = conn.info.get(_COUNTER_INFO_KEY, 0)
+    conn.info[_COUNTER_INFO_KEY] = counter + 1
+    stmt_name = f"rm_stmt_{counter}"
+
+    await conn.exec_driver_sql(f"PREPARE {stmt_name} FROM %s", (sql,))
+    registry[sql] = stmt_name
+    _stats.setdefault(sql, PreparedStatementStats()).prepares += 1
+    return stmt_name
+
+
+async def execute_prepared(
+    conn: AsyncConnection, query: str, args: dict[str, Any] | None
+) -> CursorResult:
+    """
+    Execute query as a prepared statement of conn, preparing it first if needed.
+    """
+    sql, names = _to_positional(query)
+    registry: dict[str, str] = conn.info.setdefault(_REGISTRY_INFO_KEY, dict())
+
+    stmt_name = registry.get(sql) or await _prepare(conn, sql)
+    _stats.setdefault(sql, PreparedStatementStats()).executions += 1
+
+    using = ""
+    if names:
+        variables = [f"@rm_p{i}" for i in range(len(names))]
+        await conn.exec_driver_sql(
+            "SET " + ", ".join(f"{v} = %s" for v in variables),
+            tuple((args or {})[name] for name in names),
+        )
+        using = " USING " + ", ".join(variables)
+
+    try:
+        return await conn.exec_driver_sql(f"EXECUTE {stmt_name}{using}")
+    except DBAPIError as e:
+        orig_args = getattr(e.orig, "args", None)
+        if not orig_args or orig_args[0] != UNKNOWN_STMT_HANDLER_ERROR:
+            raise
+    # The server dropped the statement (e.g. session reset), prepare it again
+    registry.pop(sql, None)
+    stmt_name = await _prepare(conn, sql)
+    return await conn.exec_driver_sql(f"EXECUTE {stmt_name}{using}")
@@ -0,0 +1,202 @@
+"""
+Shape-keyed cache of the SQL generated by AMysqlClient.
+
+Two calls using the same table, condition kinds, column names, IN-list size
+bucket and order/limit share the exact same SQL text, with ordinal
+placeholders (:p0, :p1, ...). The text is assembled once per shape, and being
+stable it is also hit by SQLAlchemy's compiled cache.
+"""
+
+from typing import Any, Callable
+
+from cachetools import LRUCache
+
+COMPILED_QUERIES_MAXSIZE = 1024
+
+# Order matters: it is the order of the placeholders in the generated SQL.
+COMPARISON_SYMBOLS = ("=", "<>", "<=", ">=", "<", ">")
+
+_compiled_queries: LRUCache[tuple, str] = LRUCache(maxsize=COMPILED_QUERIES_MAXSIZE)
+_param_names: list[str] = list()
+
+
+def in_bucket(size: int) -> int:
+    """
+    IN lists are padded up to the next power of two, so lists of close sizes share the same query.
+    """
+    if size == 0:
+        return 0
+    return 1 << (size - 1).bit_length()
+
+
+def param_name(index: int) -> str:
+    return f"p{index}"
+
+
+def bind(values: list[Any]) -> dict[str, Any]:
+    """
+    Map ordinal placeholder names to their values.
+    """
+    for index in range(len(_param_names), len(values)):
+        _param_names.append(param_name(index))
+    return dict(zip(_param_names, values))
+
+
+def cond_shape_and_values(
+    cond_null: list[str],
+    cond_not_null: list[str],
+    cond_in: dict[str, list],
+    cond_equal: dict[str, Any],
+    cond_non_equal: dict[str, Any],
+    cond_less_or_eq: dict[str, Any],
+    cond_greater_or_eq: dict[str, Any],
+    cond_less: dict[str, Any],
+    cond_greater: dict[str, Any],
+) -> tuple[tuple, list[Any]]:
+    """
+    Returns
+    -------
+    tuple
+        The hashable shape of the conditions, usable as (part of) a cache key
+    list
+        The values to bind, in placeholder order
+    """
+    values: list[Any] = list()
+
+    in_shape = list()
+    for col, ls_val in cond_in.items():
+        bucket = in_bucket(len(ls_val))
+        in_shape.append((col, bucket))
+        if bucket:
+            values.extend(ls_val)
+            # Repeating a value does not change the result of a IN
+            values.extend([ls_val[-1]] * (bucket - len(ls_val)))
+
+    comparison_shape = list()
+    for colvalues in (
+        cond_equal,
+        cond_non_equal,
+        cond_less_or_eq,
+        cond_greater_or_eq,
+        cond_less,
+        cond_greater,
+    ):
+        comparison_shape.append(tuple(colvalues))
+        values.extend(colvalues.values())
+
+    shape = (
+        tuple(cond_null),
+        tuple(cond_not_null),
+        tuple(in_shape),
+        tuple(comparison_shape),
+    )
+    return shape, values
+
+
+def render_cond(shape: tuple) -> tuple[str, int]:
+    """
+    Render the condition of a shape made by cond_shape_and_values.
+
+    Returns
+    -------
+    str
+        The condition starting with WHERE of the sql query
+    int
+        The number of placeholders used by the condition
+    """
+    cond_null, cond_not_null, in_shape, comparison_shape = shape
+    conds = ["WHERE 1 = 1"]
+    index = 0
+
+    for col in cond_null:
+        conds.append(f"AND {col} IS NULL")
+
+    for col in cond_not_null:
+        conds.append(f"AND {col} IS NOT NULL")
+
+    for col, bucket in in_shape:
+        if bucket == 0:
+            # No values in the in -> no match
+            conds.append("AND 1 = 0")
+            continue
+        placeholders = [f":{param_name(i)}" for i in range(index, index + bucket)]
+        conds.append(f"AND {col} IN (" + ",".join(placeholders) + ")")
+        index += bucket
+
+    for symbol, cols in zip(COMPARISON_SYMBOLS, comparison_shape):
+        for col in cols:
+            conds.append(f"AND {col} {symbol} :{param_name(index)}")
+            index += 1
+
+    return " ".join(conds), index
+
+
+def order_by_columns(order_by: str) -> list[str]:
+    return [col.strip() for col in order_by.split(",")]
+
+
+def render_order_by(order_by: str, ascending_order: bool) -> str:
+    direction = "ASC" if ascending_order else "DESC"
+    return "ORDER BY " + ", ".join(
+        f"{col} {direction}" for col in order_by_columns(order_by)
+    )
+
+
+def keyset_values(order_by: str, after: tuple) -> list[Any]:
+    """
+    Values to bind for the keyset condition rendered by render_keyset.
+
+    Raises
+    ------
+    ValueError
+        If after does not have one value per order_by column
+    """
+    if len(after) != len(order_by_columns(order_by)):
+        raise ValueError(
+            f"Keyset pagination needs one value per order_by column, {order_by=} {after=}"
+        )
+    values: list[Any] = list()
+    for i in range(len(after)):
+        values.extend(after[: i + 1])
+    return values
+
+
+def render_keyset(
+    order_by: str, ascending_order: bool, start_index: int
+) -> tuple[str, int]:
+    """
+    Condition selecting the rows after a keyset of the order_by columns,
+    e.g. AND (a > :p0 OR (a = :p1 AND b > :p2)).
+    Expanded rather than a row comparison, for MySQL to range scan the index.
+
+    Returns
+    -------
+    str
+        The condition, starting with AND
+    int
+        The number of placeholders used by the condition
+    """
+    symbol = ">" if ascending_order else "<"
+    columns = order_by_columns(order_by)
+    index = start_index
+    ors = list()
+    for i, col in enumerate(columns):
+        ands = list()
+        for previous_col in columns[:i]:
+            ands.append(f"{previous_col} = :{param_name(index)}")
+            index += 1
+        ands.append(f"{col} {symbol} :{param_name(index)}")
+        index += 1
+        ors.append(ands[0] if len(ands) == 1 else f"({' AND '.join(ands)})")
+    return f"AND ({' OR '.join(ors)})", index - start_index
+
+
+def get_compiled_query(key: tuple, build: Callable[..., str], *build_args: Any) -> str:
+    """
+    Returns the cached query for key, building it with build(*build_args) on a miss.
+    """
+    query = _compiled_queries.get(key)
+    if query is None:
+        query = build(*build_args)
+        _compiled_queries[key] = query
+    return query
@@ -0,0 +1,81 @@
+"""
+Read replicas of AMysqlClientReader.
+
+Reads are balanced over the replicas that passed their last health check, and
+fall back to the primary when none did. The health checks run in the
+background of each worker, started and stopped with the engines.
+"""
+
+import asyncio
+from itertools import count
+from logging import Logger
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+from src.config.mysql import ReplicaBalancing
+
+HEALTH_CHECK_TIMEOUT_S = 2
+
+
+def _checked_out(engine: AsyncEngine) -> int:
+    return engine.pool.checkedout() if isinstance(engine.pool, QueuePool) else 0
+
+
+async def is_healthy(engine: AsyncEngine) -> bool:
+    """
+    Whether a connection of engine answers a SELECT 1 in time.
+    """
+    try:
+        async with asyncio.timeout(HEALTH_CHECK_TIMEOUT_S):
+            async with engine.connect() as conn:
+                await conn.exec_driver_sql("SELECT 1")
+    except Exception:
+        return False
+    return True
+
+
+class ReplicaSet:
+    def __init__(
+        self,
+        engines: dict[str, AsyncEngine],
+        balancing: ReplicaBalancing,
+        logger: Logger,
+    ) -> None:
+        self.engines = engines
+        self.balancing = balancing
+        self.logger = logger
+        # Trusted until their first health check
+        self.healthy: list[str] = list(engines)
+        self._round_robin = count()
+
+    def choose(self) -> tuple[str, AsyncEngine] | None:
+        """
+        The name and engine of the replica to read from, None if none is healthy.
+        """
+        healthy = self.healthy
+        if not healthy:
+            return None
+        if self.balancing == ReplicaBalancing.LEAST_CONNECTIONS:
+            name = min(healthy, key=lambda n: _checked_out(self.engines[n]))
+        else:
+            name = healthy[next(self._round_robin) % len(healthy)]
+        return name, self.engines[name]
+
+    async def check_health(self) -> None:
+        results = await asyncio.gather(
+            *(is_healthy(engine) for engine in self.engines.values())
+        )
+        healthy = [name for name, ok in zip(self.engines, results) if ok]
+
+        for name in set(self.healthy) - set(healthy):
+            self.logger.warning(f"Replica {name} failed its health check.")
+        for name in set(healthy) - set(self.healthy):
+            self.logger.info(f"Replica {name} is healthy again.")
+        if not healthy:
+            self.logger.critical("No healthy replica, reading from the primary.")
+        self.healthy = healthy
+
+    async def run_health_checks(self, interval_s: float) -> None:
+        while True:
+            await asyncio.sleep(interval_s)
+            await self.check_health()
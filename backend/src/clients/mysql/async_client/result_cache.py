@@ -0,0 +1,100 @@
+"""
+Result cache of AMysqlClientReader.
+
+Rows are cached by query, args and the version of each table the query reads.
+AMysqlClientWriter bumps the version of the tables it writes once its statement
+or transaction is commited, so the former entries are never hit again and age
+out of the LRU/TTL cache. The versions live in the worker, a write done by
+another worker is only seen once the entry expires: the TTL bounds staleness.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Sequence
+
+from cachetools import TTLCache
+from sqlalchemy import Row
+from src.config.mysql import mysql_config
+
+_TABLE = re.compile(r"(?:^\s*UPDATE|\bFROM|\bJOIN|\bINTO)\s+`?(\w+)", re.IGNORECASE)
+_READ_ONLY = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+
+
+@dataclass
+class ResultCacheStats:
+    hits: int = 0
+    misses: int = 0
+    # Queries with unhashable args, never cached
+    uncacheable: int = 0
+    size: int = 0
+    maxsize: int = 0
+
+
+_results: TTLCache[tuple, Sequence[Row]] = TTLCache(
+    maxsize=mysql_config.result_cache_maxsize, ttl=mysql_config.result_cache_ttl
+)
+_table_versions: dict[str, int] = dict()
+_stats = ResultCacheStats()
+
+
+def get_result_cache_stats() -> ResultCacheStats:
+    return ResultCacheStats(
+        hits=_stats.hits,
+        misses=_stats.misses,
+        uncacheable=_stats.uncacheable,
+        size=int(_results.currsize),
+        maxsize=int(_results.maxsize),
+    )
+
+
+@lru_cache(maxsize=1024)
+def query_tables(query: str) -> tuple[str, ...]:
+    """
+    The tables a query reads or writes, from its FROM, JOIN, INTO and UPDATE.
+    """
+    return tuple(dict.fromkeys(_TABLE.findall(query)))
+
+
+def written_tables(query: str) -> tuple[str, ...]:
+    """
+    The tables whose version a statement of the writer bumps, none for a SELECT.
+    """
+    if _READ_ONLY.match(query):
+        return ()
+    return query_tables(query)
+
+
+def get_cached_rows(
+    query: str, args: dict[str, Any] | None
+) -> tuple[tuple | None, Sequence[Row] | None]:
+    """
+    Returns
+    -------
+    tuple | None
+        The key to store the rows under after a miss, None if they can not be cached
+    Sequence | None
+        The cached rows, None on a miss
+    """
+    versions = tuple(_table_versions.get(t, 0) for t in query_tables(query))
+    key = (query, tuple((args or {}).items()), versions)
+    try:
+        rows = _results.get(key)
+    except TypeError:
+        _stats.uncacheable += 1
+        return None, None
+
+    if rows is None:
+        _stats.misses += 1
+    else:
+        _stats.hits += 1
+    return key, rows
+
+
+def store_rows(key: tuple, rows: Sequence[Row]) -> None:
+    _results[key] = rows
+
+
+def bump_table_versions(tables: set[str] | tuple[str, ...]) -> None:
+    for table in tables:
+        _table_versions[table] = _table_versions.get(table, 0) + 1
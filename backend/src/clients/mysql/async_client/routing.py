@@ -0,0 +1,43 @@
+"""
+Read-your-writes for AMysqlClientReader.
+
+Replicas lag behind the primary, so once a writer checked out a connection, the
+reads of the same request are pinned to the primary for a short window. The pin
+is a mutable object shared through a contextvar, so that a middleware can read
+back what the request handler did and carry it to the next requests of the user.
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from src.config.mysql import mysql_config
+
+
+@dataclass
+class PrimaryPin:
+    # Timestamp until which the reads go to the primary
+    until: float = 0
+
+
+_primary_pin: ContextVar[PrimaryPin | None] = ContextVar("primary_pin", default=None)
+
+
+def start_primary_pin(until: float = 0) -> PrimaryPin:
+    """
+    Start the pin of the current context, e.g. a request.
+    Tasks spawned afterwards share the returned pin.
+    """
+    pin = PrimaryPin(until=until)
+    _primary_pin.set(pin)
+    return pin
+
+
+def pin_reads_to_primary() -> None:
+    pin = _primary_pin.get() or start_primary_pin()
+    pin.until = time.time() + mysql_config.read_your_writes_window
+
+
+def is_pinned_to_primary() -> bool:
+    pin = _primary_pin.get()
+    return pin is not None and pin.until > time.time()
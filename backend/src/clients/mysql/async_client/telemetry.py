@@ -0,0 +1,124 @@
+"""
+Per fingerprint statistics of the statements run by AMysqlClient.
+
+A fingerprint is the statement with its placeholders, literals, IN lists and
+optimizer hints normalized, so that all the calls of a service function share
+it. Recording is skipped altogether unless enabled in the config.
+"""
+
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import lru_cache
+from types import FrameType
+
+from src.config.mysql import mysql_config
+
+# Key of the connection info holding its checkout wait, until its first statement
+CHECKOUT_WAIT_INFO_KEY = "checkout_wait_s"
+# Upper bounds in milliseconds of the latency histogram buckets, the last one is unbounded
+LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)
+
+_HINT = re.compile(r"/\*\+.*?\*/")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'|(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"(?<![:\w]):\w+|%s|\?")
+_SPACES = re.compile(r"\s+")
+# Frames skipped to find the function issuing a statement
+_SKIPPED_MODULES = (__name__.rpartition(".")[0], "contextlib")
+
+
+class QueryStatsOrder(str, Enum):
+    TOTAL_TIME = "total_time"
+    COUNT = "count"
+    ROWS = "rows"
+    MAX_TIME = "max_time"
+    POOL_WAIT = "pool_wait"
+
+
+@dataclass
+class StatementRun:
+    # The query sent, possibly with hints
+    query: str
+    # Rows returned or affected, -1 if unknown
+    rowcount: int = -1
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    rows: int = 0
+    total_s: float = 0
+    max_s: float = 0
+    pool_wait_s: float = 0
+    # Statements per bucket of LATENCY_BUCKETS_MS, plus the unbounded one
+    latency_histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    )
+    # Statements per "module.function" outside of the client issuing them
+    callers: Counter[str] = field(default_factory=Counter)
+
+
+_stats: dict[str, QueryStats] = dict()
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(query: str) -> str:
+    query = _HINT.sub("", query)
+    query = _PLACEHOLDER.sub("?", _LITERAL.sub("?", query))
+    query = _IN_LIST.sub("IN (...)", query)
+    return _SPACES.sub(" ", query).strip().removesuffix(";").strip()
+
+
+def _caller() -> str:
+    frame: FrameType | None = sys._getframe(2)
+    while frame is not None and frame.f_globals.get("__name__", "").startswith(
+        _SKIPPED_MODULES
+    ):
+        frame = frame.f_back
+    if frame is None:
+        return "unknown"
+    return f"{frame.f_globals.get("__name__")}.{frame.f_code.co_name}"
+
+
+def record_statement(
+    query: str, rows: int, elapsed_s: float, pool_wait_s: float
+) -> None:
+    if not mysql_config.query_telemetry:
+        return
+    stats = _stats.setdefault(fingerprint(query), QueryStats())
+    stats.count += 1
+    stats.rows += max(rows, 0)
+    stats.total_s += elapsed_s
+    stats.max_s = max(stats.max_s, elapsed_s)
+    stats.pool_wait_s += pool_wait_s
+
+    elapsed_ms = elapsed_s * 1e3
+    bucket = next(
+        (i for i, bound in enumerate(LATENCY_BUCKETS_MS) if elapsed_ms <= bound),
+        len(LATENCY_BUCKETS_MS),
+    )
+    stats.latency_histogram[bucket] += 1
+    stats.callers[_caller()] += 1
+
+
+def get_top_queries(
+    n: int = 20, order: QueryStatsOrder = QueryStatsOrder.TOTAL_TIME
+) -> list[tuple[str, QueryStats]]:
+    """
+    The n fingerprints of this process ranking first by order, with their statistics.
+    """
+    key = {
+        QueryStatsOrder.TOTAL_TIME: lambda s: s.total_s,
+        QueryStatsOrder.COUNT: lambda s: s.count,
+        QueryStatsOrder.ROWS: lambda s: s.rows,
+        QueryStatsOrder.MAX_TIME: lambda s: s.max_s,
+        QueryStatsOrder.POOL_WAIT: lambda s: s.pool_wait_s,
+    }[order]
+    return sorted(_stats.items(), key=lambda item: key(item[1]), reverse=True)[:n]
+
+
+def reset_query_stats() -> None:
+    _stats.clear()
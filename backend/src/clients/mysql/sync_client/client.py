@@ -1,12 +1,14 @@
 ## NOTE: This client is sync and should not be used with FAST API, but with scripts
 import traceback
 from abc import ABC, abstractmethod
+from itertools import batched
 from logging import Logger
-from typing import Any, Literal, Type, TypeVar, overload
+from typing import Any, Iterator, Literal, Type, TypeVar, overload
 
 import pymysql.cursors
 from src.config.mysql import mysql_config
 from src.logger import get_logger
+from src.models.aggregate import Aggregate, render_aggregate_select
 from src.models.database import BaseTableModel
 
 from .exceptions import (
@@ -16,6 +18,10 @@ from .exceptions import (
 )
 
 base_logger = get_logger()
+# Ids per DELETE statement, keeps the IN lists bounded
+DELETE_CHUNK_SIZE = 1000
+# Rows fetched at once by the unbuffered cursor of select_iter
+STREAM_BATCH_SIZE = 1000
 GenericTableModel = TypeVar("GenericTableModel", bound=BaseTableModel)
 
 
@@ -101,6 +107,59 @@ class MysqlClient(ABC):
 
         return " ".join(conds), tuple(args)
 
+    def _to_models(
+        self, table: Type[GenericTableModel], rows: tuple[dict[str, Any], ...]
+    ) -> tuple[GenericTableModel, ...]:
+        if mysql_config.trusted_hydration:
+            return tuple(table.from_db(r) for r in rows)
+        return tuple(table(**r) for r in rows)
+
+    def _build_select(
+        self,
+        table: Type[GenericTableModel],
+        cond_null: list[str],
+        cond_not_null: list[str],
+        cond_in: dict[str, list],
+        cond_equal: dict[str, Any],
+        cond_non_equal: dict[str, Any],
+        cond_less_or_eq: dict[str, Any],
+        cond_greater_or_eq: dict[str, Any],
+        cond_less: dict[str, Any],
+        cond_greater: dict[str, Any],
+        order_by: str,
+        ascending_order: bool,
+        limit: int,
+        offset: int,
+        columns: list[str] | None,
+    ) -> tuple[str, tuple]:
+        """
+        Returns the query of a select and its args.
+        """
+        query_parts = [
+            f"SELECT {', '.join(columns) if columns else '*'} FROM {table.__tablename__}"
+        ]
+        cond, args = self._generate_cond(
+            cond_equal=cond_equal,
+            cond_greater=cond_greater,
+            cond_greater_or_eq=cond_greater_or_eq,
+            cond_in=cond_in,
+            cond_less=cond_less,
+            cond_less_or_eq=cond_less_or_eq,
+            cond_non_equal=cond_non_equal,
+            cond_not_null=cond_not_null,
+            cond_null=cond_null,
+        )
+        query_parts.append(cond)
+        if order_by:
+            query_parts.append(
+                f"ORDER BY {order_by} {'ASC' if ascending_order else 'DESC'}"
+            )
+        if limit > 0:
+            query_parts.append(f"LIMIT {limit}")
+            query_parts.append(f"OFFSET {offset}")
+        query_parts.append(";")
+        return " ".join(query_parts), args
+
     @overload
     def execute(
         self,
@@ -240,6 +299,72 @@ class MysqlClient(ABC):
         res = res_mysql[0].get("ct", None)
         return int(str(res)) if res else -1
 
+    def aggregate(
+        self,
+        table: Type[GenericTableModel],
+        aggregates: dict[str, Aggregate],
+        group_by: list[str] = list(),
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, Any] = dict(),
+        cond_non_equal: dict[str, Any] = dict(),
+        cond_less_or_eq: dict[str, Any] = dict(),
+        cond_greater_or_eq: dict[str, Any] = dict(),
+        cond_less: dict[str, Any] = dict(),
+        cond_greater: dict[str, Any] = dict(),
+    ) -> tuple[dict[str, Any], ...]:
+        """
+        Execute a SELECT of aggregates (SUM, COUNT, MIN, MAX) with various conditions,
+        one row per group of the group_by columns.
+
+        Parameters
+        ----------
+        table : Type[T]
+            Table class to query from
+        aggregates : dict[str, Aggregate]
+            Aggregated columns, by their alias in the result rows
+        group_by : list[str], optional
+            Columns to group by, by default a single row for the whole table
+        cond_* : optional
+            Same as select
+
+        Returns
+        -------
+        tuple
+            One dict per group, of the group_by columns and the aliases of the aggregates.
+            A SUM of integers is a Decimal, and None if there is no row.
+
+        Raises
+        ------
+        MySqlNoConnectionError
+            If no database connection exists
+        MySqlWrongQueryError
+            If query is wrong, or a column is not in the table
+        """
+        try:
+            query_parts = [render_aggregate_select(table, aggregates, group_by)]
+        except ValueError as e:
+            raise MySqlWrongQueryError(str(e))
+        cond, args = self._generate_cond(
+            cond_equal=cond_equal,
+            cond_greater=cond_greater,
+            cond_greater_or_eq=cond_greater_or_eq,
+            cond_in=cond_in,
+            cond_less=cond_less,
+            cond_less_or_eq=cond_less_or_eq,
+            cond_non_equal=cond_non_equal,
+            cond_not_null=cond_not_null,
+            cond_null=cond_null,
+        )
+        query_parts.append(cond)
+        if group_by:
+            query_parts.append(f"GROUP BY {', '.join(group_by)}")
+        query_parts.append(";")
+
+        return self.execute(query=" ".join(query_parts), args=args)
+
+    @overload
     def select(
         self,
         table: Type[GenericTableModel],
@@ -256,7 +381,48 @@ class MysqlClient(ABC):
         ascending_order: bool = True,
         limit: int = 0,
         offset: int = 0,
-    ) -> tuple[GenericTableModel, ...]:
+        columns: None = None,
+    ) -> tuple[GenericTableModel, ...]: ...
+
+    @overload
+    def select(
+        self,
+        table: Type[GenericTableModel],
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, Any] = dict(),
+        cond_non_equal: dict[str, Any] = dict(),
+        cond_less_or_eq: dict[str, Any] = dict(),
+        cond_greater_or_eq: dict[str, Any] = dict(),
+        cond_less: dict[str, Any] = dict(),
+        cond_greater: dict[str, Any] = dict(),
+        order_by: str = "",
+        ascending_order: bool = True,
+        limit: int = 0,
+        offset: int = 0,
+        *,
+        columns: list[str],
+    ) -> tuple[Any, ...]: ...
+
+    def select(
+        self,
+        table: Type[GenericTableModel],
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, Any] = dict(),
+        cond_non_equal: dict[str, Any] = dict(),
+        cond_less_or_eq: dict[str, Any] = dict(),
+        cond_greater_or_eq: dict[str, Any] = dict(),
+        cond_less: dict[str, Any] = dict(),
+        cond_greater: dict[str, Any] = dict(),
+        order_by: str = "",
+        ascending_order: bool = True,
+        limit: int = 0,
+        offset: int = 0,
+        columns: list[str] | None = None,
+    ) -> tuple[GenericTableModel, ...] | tuple[Any, ...]:
         """
         Execute a SELECT query with various conditions.
 
@@ -264,8 +430,6 @@ class MysqlClient(ABC):
         ----------
         table : Type[T]
             Table class to query from
-        select_col : list[str], optional
-            List of columns to select, by default all columns. Note that this should not be used with a SqlModel expected return.
         cond_null : list[str], optional
             Columns that must be NULL
         cond_not_null : list[str], optional
@@ -288,42 +452,180 @@ class MysqlClient(ABC):
             Maximum number of rows to return, 0 means all, by default 0
         offset : int, optional
             Number of rows to skip before returning results, 0 means no offset, by default 0
+        columns : list[str] | None, optional
+            Only fetch these columns, the rows are then namedtuples of them instead of the actual class, by default all columns
 
         Returns
         -------
         tuple
-            Query results as actual class
+            Query results as actual class, or as namedtuples if columns is given
 
         Raises
         ------
         MySqlNoConnectionError
             If no database connection exists
         MySqlWrongQueryError
-            If query is wrong
+            If query is wrong, or a column is not in the table
         """
-        query_parts = [f"SELECT * FROM {table.__tablename__}"]
-        cond, args = self._generate_cond(
+        if columns is not None:
+            try:
+                table.projection_row_type(columns)
+            except ValueError as e:
+                raise MySqlWrongQueryError(str(e))
+
+        query, args = self._build_select(
+            table=table,
+            cond_null=cond_null,
+            cond_not_null=cond_not_null,
+            cond_in=cond_in,
             cond_equal=cond_equal,
-            cond_greater=cond_greater,
+            cond_non_equal=cond_non_equal,
+            cond_less_or_eq=cond_less_or_eq,
             cond_greater_or_eq=cond_greater_or_eq,
-            cond_in=cond_in,
             cond_less=cond_less,
-            cond_less_or_eq=cond_less_or_eq,
-            cond_non_equal=cond_non_equal,
-            cond_not_null=cond_not_null,
+            cond_greater=cond_greater,
+            order_by=order_by,
+            ascending_order=ascending_order,
+            limit=limit,
+            offset=offset,
+            columns=columns,
+        )
+        res_mysql = self.execute(query=query, args=args)
+        if columns is not None:
+            # DictCursor rows keep the order of the selected columns
+            return tuple(table.rows_from_db(columns, (r.values() for r in res_mysql)))
+        return self._to_models(table, res_mysql)
+
+    @overload
+    def select_iter(
+        self,
+        table: Type[GenericTableModel],
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, Any] = dict(),
+        cond_non_equal: dict[str, Any] = dict(),
+        cond_less_or_eq: dict[str, Any] = dict(),
+        cond_greater_or_eq: dict[str, Any] = dict(),
+        cond_less: dict[str, Any] = dict(),
+        cond_greater: dict[str, Any] = dict(),
+        order_by: str = "",
+        ascending_order: bool = True,
+        batch_size: int = STREAM_BATCH_SIZE,
+        columns: None = None,
+    ) -> Iterator[GenericTableModel]: ...
+
+    @overload
+    def select_iter(
+        self,
+        table: Type[GenericTableModel],
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, Any] = dict(),
+        cond_non_equal: dict[str, Any] = dict(),
+        cond_less_or_eq: dict[str, Any] = dict(),
+        cond_greater_or_eq: dict[str, Any] = dict(),
+        cond_less: dict[str, Any] = dict(),
+        cond_greater: dict[str, Any] = dict(),
+        order_by: str = "",
+        ascending_order: bool = True,
+        batch_size: int = STREAM_BATCH_SIZE,
+        *,
+        columns: list[str],
+    ) -> Iterator[Any]: ...
+
+    def select_iter(
+        self,
+        table: Type[GenericTableModel],
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, Any] = dict(),
+        cond_non_equal: dict[str, Any] = dict(),
+        cond_less_or_eq: dict[str, Any] = dict(),
+        cond_greater_or_eq: dict[str, Any] = dict(),
+        cond_less: dict[str, Any] = dict(),
+        cond_greater: dict[str, Any] = dict(),
+        order_by: str = "",
+        ascending_order: bool = True,
+        batch_size: int = STREAM_BATCH_SIZE,
+        columns: list[str] | None = None,
+    ) -> Iterator[GenericTableModel] | Iterator[Any]:
+        """
+        Same as select, but streams the rows with an unbuffered cursor instead of
+        fetching them all, only batch_size rows are held in memory at once.
+        No other statement can be run on the connection until the iteration ends.
+
+        Parameters
+        ----------
+        table : Type[T]
+            Table class to query from
+        cond_* : optional
+            Same as select
+        order_by : str, optional
+            Column to order the rows by, by default no order
+        ascending_order : bool, optional
+            Order direction, by default True
+        batch_size : int, optional
+            Number of rows fetched from the server at once, by default STREAM_BATCH_SIZE
+        columns : list[str] | None, optional
+            Only fetch these columns, the rows are then namedtuples of them instead of the actual class, by default all columns
+
+        Yields
+        ------
+        GenericTableModel | namedtuple
+            Rows as actual class, or as namedtuples if columns is given
+
+        Raises
+        ------
+        MySqlNoConnectionError
+            If no database connection exists
+        MySqlWrongQueryError
+            If query is wrong, or a column is not in the table
+        """
+        if columns is not None:
+            try:
+                table.projection_row_type(columns)
+            except ValueError as e:
+                raise MySqlWrongQueryError(str(e))
+        if not self.connection:
+            raise MySqlNoConnectionError("Could not execute query, no connection yet.")
+
+        query, args = self._build_select(
+            table=table,
             cond_null=cond_null,
+            cond_not_null=cond_not_null,
+            cond_in=cond_in,
+            cond_equal=cond_equal,
+            cond_non_equal=cond_non_equal,
+            cond_less_or_eq=cond_less_or_eq,
+            cond_greater_or_eq=cond_greater_or_eq,
+            cond_less=cond_less,
+            cond_greater=cond_greater,
+            order_by=order_by,
+            ascending_order=ascending_order,
+            limit=0,
+            offset=0,
+            columns=columns,
         )
-        query_parts.append(cond)
-        if order_by:
-            query_parts.append(
-                f"ORDER BY {order_by} {'ASC' if ascending_order else 'DESC'}"
-            )
-        if limit > 0:
-            query_parts.append(f"LIMIT {limit}")
-            query_parts.append(f"OFFSET {offset}")
-        query_parts.append(";")
-        res_mysql = self.execute(query=" ".join(query_parts), args=args)
-        return tuple(table(**r) for r in res_mysql)
+
+        with self.connection.cursor(pymysql.cursors.SSDictCursor) as cursor:
+            try:
+                cursor.execute(query=query, args=args)
+            except pymysql.err.ProgrammingError:
+                self.logger.warning(
+                    f"error while executing query, {traceback.format_exc()}"
+                )
+                raise MySqlWrongQueryError(f"{traceback.format_exc()}")
+            finally:
+                self._logging(cursor)
+
+            while batch := cursor.fetchmany(batch_size):
+                if columns is not None:
+                    yield from table.rows_from_db(columns, (r.values() for r in batch))
+                else:
+                    yield from self._to_models(table, tuple(batch))
 
     def select_by_id(
         self,
@@ -552,6 +854,7 @@ class MysqlClientWriter(MysqlClient):
     ) -> tuple[GenericTableModel, ...]:
         """
         Delete rows from a database table based on conditions and returns them.
+        The rows are read with SELECT ... FOR UPDATE and deleted by chunks of ids, within the current transaction.
 
         Parameters
         ----------
@@ -588,8 +891,7 @@ class MysqlClientWriter(MysqlClient):
         MySqlWrongQueryError
             If query is wrong
         """
-        res_mysql = self.select(
-            table=table,
+        cond, args = self._generate_cond(
             cond_equal=cond_equal,
             cond_greater=cond_greater,
             cond_greater_or_eq=cond_greater_or_eq,
@@ -600,17 +902,25 @@ class MysqlClientWriter(MysqlClient):
             cond_not_null=cond_not_null,
             cond_null=cond_null,
         )
-        ids_to_delete_ls: list[int] = [r.id for r in res_mysql]
+        # Locked until the commit, the rows returned are the rows deleted
+        res_mysql = self._to_models(
+            table,
+            self.execute(
+                query=f"SELECT * FROM {table.__tablename__} {cond} FOR UPDATE ;",
+                args=args,
+            ),
+        )
 
-        if not ids_to_delete_ls:
+        if not res_mysql:
             self.logger.info("nothing to delete")
             return tuple()
 
-        query_parts = [f"DELETE FROM {table.__tablename__}"]
-        query_parts.append(f"WHERE id IN ({", ".join(["%s"]*len(ids_to_delete_ls))})")
-        query_parts.append(";")
+        for ids_chunk in batched([r.id for r in res_mysql], DELETE_CHUNK_SIZE):
+            query_parts = [f"DELETE FROM {table.__tablename__}"]
+            query_parts.append(f"WHERE id IN ({", ".join(["%s"]*len(ids_chunk))})")
+            query_parts.append(";")
 
-        self.execute(query=" ".join(query_parts), args=tuple(ids_to_delete_ls))
+            self.execute(query=" ".join(query_parts), args=ids_chunk)
         return res_mysql
 
     def delete_by_id(
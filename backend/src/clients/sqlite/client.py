@@ -3,10 +3,11 @@ import threading
 import traceback
 from abc import ABC
 from logging import Logger
-from typing import Any, Literal, Type, TypeVar
+from typing import Any, Literal, Type, TypeVar, overload
 
 from src.config.path import path_config
 from src.logger import get_logger
+from src.models.aggregate import Aggregate, render_aggregate_select
 from src.models.database import BaseTableModel
 
 from .exceptions import (
@@ -16,6 +17,7 @@ from .exceptions import (
     SqliteNoConnectionError,
     SqliteNoUpdateValuesError,
     SqliteNoValueInsertionError,
+    SqliteWrongQueryError,
 )
 
 GenericTableModel = TypeVar("GenericTableModel", bound=BaseTableModel)
@@ -123,7 +125,25 @@ class SQLiteClient(ABC):
 
         return " ".join(conds), tuple(args)
 
-    def execute(self, query: str, args: tuple | None = None) -> list[dict[str, Any]]:
+    @overload
+    def execute(
+        self,
+        query: str,
+        args: tuple | None = None,
+        affected_rows: Literal[False] = False,
+    ) -> list[dict[str, Any]]: ...
+
+    @overload
+    def execute(
+        self,
+        query: str,
+        args: tuple | None,
+        affected_rows: Literal[True],
+    ) -> int: ...
+
+    def execute(
+        self, query: str, args: tuple | None = None, affected_rows: bool = False
+    ) -> list[dict[str, Any]] | int:
         """
         Execute a SQL query and return the results.
 
@@ -133,18 +153,22 @@ class SQLiteClient(ABC):
             SQL query to execute
         args : tuple | None, optional
             Parameters to pass to the query, by default None
+        affected_rows : bool, optional
+            Return the number of rows affected by the statement instead, by default False
 
         Returns
         -------
         tuple
             Results of the query execution
+        int
+            The number of affected rows
         """
         if not self.connection:
             raise SqliteNoConnectionError("Could not execute query, no connection yet.")
         self.cursor = self.connection.cursor()
         try:
             self.cursor.execute(query, args or ())
-            res = self.cursor.fetchall()
+            res = self.cursor.rowcount if affected_rows else self.cursor.fetchall()
         except Exception:
             self.logger.warning(
                 f"error while executing query, {traceback.format_exc()}"
@@ -226,6 +250,72 @@ class SQLiteClient(ABC):
         res = res_Sql[0]["ct"]
         return int(str(res))
 
+    def aggregate(
+        self,
+        table: Type[GenericTableModel],
+        aggregates: dict[str, Aggregate],
+        group_by: list[str] = list(),
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, object] = dict(),
+        cond_non_equal: dict[str, object] = dict(),
+        cond_less_or_eq: dict[str, object] = dict(),
+        cond_greater_or_eq: dict[str, object] = dict(),
+        cond_less: dict[str, object] = dict(),
+        cond_greater: dict[str, object] = dict(),
+    ) -> list[dict[str, Any]]:
+        """
+        Execute a SELECT of aggregates (SUM, COUNT, MIN, MAX) with various conditions,
+        one row per group of the group_by columns.
+
+        Parameters
+        ----------
+        table : Type[T]
+            Table class to query from
+        aggregates : dict[str, Aggregate]
+            Aggregated columns, by their alias in the result rows
+        group_by : list[str], optional
+            Columns to group by, by default a single row for the whole table
+        cond_* : optional
+            Same as select
+
+        Returns
+        -------
+        list
+            One dict per group, of the group_by columns and the aliases of the aggregates.
+            A SUM is None if there is no row.
+
+        Raises
+        ------
+        SqliteNoConnectionError
+            If no database connection exists
+        SqliteWrongQueryError
+            If query is wrong, or a column is not in the table
+        """
+        try:
+            query_parts = [render_aggregate_select(table, aggregates, group_by)]
+        except ValueError as e:
+            raise SqliteWrongQueryError(str(e))
+        cond, args = self._generate_cond(
+            cond_equal=cond_equal,
+            cond_greater=cond_greater,
+            cond_greater_or_eq=cond_greater_or_eq,
+            cond_in=cond_in,
+            cond_less=cond_less,
+            cond_less_or_eq=cond_less_or_eq,
+            cond_non_equal=cond_non_equal,
+            cond_not_null=cond_not_null,
+            cond_null=cond_null,
+        )
+        query_parts.append(cond)
+        if group_by:
+            query_parts.append(f"GROUP BY {', '.join(group_by)}")
+        query_parts.append(";")
+
+        return self.execute(query=" ".join(query_parts), args=args)
+
+    @overload
     def select(
         self,
         table: Type[GenericTableModel],
@@ -242,7 +332,48 @@ class SQLiteClient(ABC):
         ascending_order: bool = True,
         limit: int = 0,
         offset: int = 0,
-    ) -> list[GenericTableModel]:
+        columns: None = None,
+    ) -> list[GenericTableModel]: ...
+
+    @overload
+    def select(
+        self,
+        table: Type[GenericTableModel],
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, object] = dict(),
+        cond_non_equal: dict[str, object] = dict(),
+        cond_less_or_eq: dict[str, object] = dict(),
+        cond_greater_or_eq: dict[str, object] = dict(),
+        cond_less: dict[str, object] = dict(),
+        cond_greater: dict[str, object] = dict(),
+        order_by: str = "",
+        ascending_order: bool = True,
+        limit: int = 0,
+        offset: int = 0,
+        *,
+        columns: list[str],
+    ) -> list[Any]: ...
+
+    def select(
+        self,
+        table: Type[GenericTableModel],
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, object] = dict(),
+        cond_non_equal: dict[str, object] = dict(),
+        cond_less_or_eq: dict[str, object] = dict(),
+        cond_greater_or_eq: dict[str, object] = dict(),
+        cond_less: dict[str, object] = dict(),
+        cond_greater: dict[str, object] = dict(),
+        order_by: str = "",
+        ascending_order: bool = True,
+        limit: int = 0,
+        offset: int = 0,
+        columns: list[str] | None = None,
+    ) -> list[GenericTableModel] | list[Any]:
         """
         Execute a SELECT query with various conditions.
 
@@ -272,13 +403,21 @@ class SQLiteClient(ABC):
             Maximum number of rows to return, 0 means all, by default 0
         offset : int, optional
             Number of rows to skip before returning results, 0 means no offset, by default 0
+        columns : list[str] | None, optional
+            Only fetch these columns, the rows are then namedtuples of them instead of the actual class, by default all columns
 
         Returns
         -------
         tuple
-            Query results as a tuple of dictionaries or actual class if given
+            Query results as a tuple of dictionaries or actual class if given, or namedtuples if columns is given
         """
-        query_parts = [f"SELECT * FROM {table.__tablename__}"]
+        if columns is not None:
+            # Also makes sure only columns of the table end up in the query
+            table.projection_row_type(columns)
+
+        query_parts = [
+            f"SELECT {', '.join(columns) if columns else '*'} FROM {table.__tablename__}"
+        ]
         cond, args = self._generate_cond(
             cond_equal=cond_equal,
             cond_greater=cond_greater,
@@ -300,6 +439,8 @@ class SQLiteClient(ABC):
             query_parts.append(f"OFFSET {offset}")
         query_parts.append(";")
         res_Sql = self.execute(query=" ".join(query_parts), args=args)
+        if columns is not None:
+            return table.rows_from_db(columns, res_Sql)
         return list(table(**r) for r in res_Sql)
 
     def select_by_id(
@@ -471,10 +612,66 @@ class SQLiteClient(ABC):
         update_col_value : dict[str, object], optional
             Dictionary mapping columns to update with specific values
         """
-        if not self.id_exists(table=table, id=id):
+        if not self.update_where(
+            table=table,
+            update_col_col=update_col_col,
+            update_col_value=update_col_value,
+            cond_equal={"id": id},
+        ):
             raise SqliteIdNotFoundError(
                 f"{id=} not found during update in table {table if isinstance(table, str) else table.__tablename__}"
             )
+
+    def update_where(
+        self,
+        table: Type[GenericTableModel],
+        update_col_col: dict[str, str] = dict(),
+        update_col_value: dict[str, object] = dict(),
+        cond_null: list[str] = list(),
+        cond_not_null: list[str] = list(),
+        cond_in: dict[str, list] = dict(),
+        cond_equal: dict[str, object] = dict(),
+        cond_non_equal: dict[str, object] = dict(),
+        cond_less_or_eq: dict[str, object] = dict(),
+        cond_greater_or_eq: dict[str, object] = dict(),
+        cond_less: dict[str, object] = dict(),
+        cond_greater: dict[str, object] = dict(),
+    ) -> int:
+        """
+        Update the rows of a table matching the conditions, in a single statement.
+
+        Parameters
+        ----------
+        table: GenericTableModel
+            Table to update
+        update_col_col : dict[str, str], optional
+            Dictionary mapping columns to update with other column values
+        update_col_value : dict[str, object], optional
+            Dictionary mapping columns to update with specific values
+        cond_null : list[str], optional
+            Columns that must be NULL
+        cond_not_null : list[str], optional
+            Columns that must not be NULL
+        cond_in : dict[str, list], optional
+            Column values that must be in given list
+        cond_eq : dict[str, object], optional
+            Column values that must equal given value
+        cond_neq : dict[str, object], optional
+            Column values that must not equal given value
+        cond_leq : dict[str, object], optional
+            Column values that must be less than or equal to given value
+        cond_geq : dict[str, object], optional
+            Column values that must be greater than or equal to given value
+        cond_l : dict[str, object], optional
+            Column values that must be less than given value
+        cond_g : dict[str, object], optional
+            Column values that must be greater than given value
+
+        Returns
+        -------
+        int
+            The number of rows matching the conditions
+        """
         for col in update_col_value:
             if col in update_col_col:
                 raise SqliteDuplicateColumnUpdateError(
@@ -495,20 +692,32 @@ class SQLiteClient(ABC):
         col_col_parts: list[str] = list()
         for col_dst, col_src in update_col_col.items():
             col_col_parts.append(f"{col_dst}={col_src}")
-        query_parts.append(",".join(col_col_parts))
 
         col_val_parts: list[str] = list()
         values = list()
         for col_dst, value in update_col_value.items():
             col_val_parts.append(f"{col_dst}=?")
             values.append(value)
-        query_parts.append(",".join(col_val_parts))
+        query_parts.append(",".join(col_col_parts + col_val_parts))
 
-        query_parts.append(f"WHERE id=?")
-        values.append(id)
+        cond, cond_args = self._generate_cond(
+            cond_equal=cond_equal,
+            cond_greater=cond_greater,
+            cond_greater_or_eq=cond_greater_or_eq,
+            cond_in=cond_in,
+            cond_less=cond_less,
+            cond_less_or_eq=cond_less_or_eq,
+            cond_non_equal=cond_non_equal,
+            cond_not_null=cond_not_null,
+            cond_null=cond_null,
+        )
+        query_parts.append(cond)
+        values.extend(cond_args)
         query_parts.append(";")
 
-        self.execute(query=" ".join(query_parts), args=tuple(values))
+        return self.execute(
+            query=" ".join(query_parts), args=tuple(values), affected_rows=True
+        )
 
     def delete(
         self,
@@ -17,12 +17,28 @@ class GoogleConfig(BaseSettings):
     client_id: str
     client_secret: str
     redirect_uri: str = f"{SITE_URL}/api/auth/google/callback"
+    # Provider endpoints, can point to a local stand-in
+    auth_url: str = "https://accounts.google.com/o/oauth2/v2/auth"
+    token_url: str = "https://oauth2.googleapis.com/token"
+    jwks_url: str = "https://www.googleapis.com/oauth2/v3/certs"
+    issuers: list[str] = ["https://accounts.google.com", "accounts.google.com"]
+    # Seconds the signing keys of the ID tokens are kept before being fetched again
+    jwks_refresh_interval: float = 3600
 
 
 class SessionConfig(BaseSettings):
     expiration_days: int = 30
     oauth_state_keyword: str = "oauth_state"
     session_token_keyword: str = "session_token"
+    # Per worker cache of the logged in users, seconds a write of another worker is not seen
+    user_cache_ttl: float = 60
+    user_cache_maxsize: int = 4096
+    # Session tokens carry the user public_id, user_name and version, refreshed
+    # from the database once older than session_claims_max_age seconds
+    session_claims: bool = False
+    session_claims_max_age: float = 300
+    # Session tokens kept verified until their expiry, per worker
+    verified_session_cache_maxsize: int = 8192
 
 
 class AuthConfig(BaseSettings):
@@ -0,0 +1,11 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class BackendConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="BACKEND_")
+
+    host: str = "localhost"
+    port: int = 8000
+
+
+backend_config = BackendConfig()
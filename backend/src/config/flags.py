@@ -5,6 +5,7 @@ class FlagsConfig(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="FLAG_")
 
     development_login: bool
+    monitoring_endpoints: bool = False
 
 
 flags_config = FlagsConfig()  # type:ignore
@@ -1,6 +1,13 @@
+from enum import Enum
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class ReplicaBalancing(str, Enum):
+    ROUND_ROBIN = "round_robin"
+    LEAST_CONNECTIONS = "least_connections"
+
+
 class MysqlConfig(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="MYSQL_")
 
@@ -11,6 +18,30 @@ class MysqlConfig(BaseSettings):
     password_writer: str
     port: int
     host: str
+    # "host" or "host:port" of the read replicas, JSON list, reads go to host if empty
+    replica_hosts: list[str] = list()
+    replica_balancing: ReplicaBalancing = ReplicaBalancing.ROUND_ROBIN
+    replica_health_check_interval: float = 5
+    # Seconds the reads stay on the primary after a write, to not read behind it
+    read_your_writes_window: float = 2
+    pool_size: int = 5
+    pool_max_overflow: int = 5
+    # Seconds to wait for a connection before failing the request
+    pool_timeout: float = 10
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    # Seconds a statement may run before AMySqlTimeoutError, 0 for no limit
+    statement_timeout: float = 10
+    prepared_statements: bool = False
+    # Per fingerprint statistics of the statements, see /api/monitoring/queries
+    query_telemetry: bool = False
+    # Readers opting in cache their results, per worker, False disables it for all
+    result_cache: bool = False
+    result_cache_maxsize: int = 1024
+    # Seconds, also bounds how long a write of another worker is not seen
+    result_cache_ttl: float = 30
+    # Reads skip the pydantic validation, False to fully validate them again
+    trusted_hydration: bool = True
 
 
 mysql_config = MysqlConfig()  # type: ignore
@@ -1,15 +1,24 @@
 import contextlib
 
 from asgi_correlation_id.middleware import CorrelationIdMiddleware, is_valid_uuid4
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 
 from .api import api_router
+from .clients.http import close_http_client, init_http_client
+from .clients.mysql import AMySqlTimeoutError, dispose_engines, init_engines
 from .config.env import ENV, ServiceEnv
+from .config.mysql import mysql_config
+from .modules.read_your_writes import ReadYourWritesMiddleware
 
 
 @contextlib.asynccontextmanager
 async def lifespan(app: FastAPI):
+    await init_engines()
+    init_http_client()
     yield
+    await close_http_client()
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -22,9 +31,24 @@ app = FastAPI(
 app.include_router(api_router)
 
 
+@app.exception_handler(AMySqlTimeoutError)
+async def database_timeout_handler(
+    request: Request, exc: AMySqlTimeoutError
+) -> JSONResponse:
+    # Overloaded rather than failing, the request can be retried
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database timeout."},
+    )
+
+
 app.add_middleware(
     CorrelationIdMiddleware,
     header_name="X-Correlation-ID",
     update_request_header=True,
     validator=is_valid_uuid4 if ENV == ServiceEnv.PRODUCTION else None,
 )
+
+# Only needed when the reads can go to a lagging replica
+if mysql_config.replica_hosts:
+    app.add_middleware(ReadYourWritesMiddleware)
@@ -0,0 +1,59 @@
+from enum import Enum
+from typing import Type
+
+from pydantic import BaseModel
+from src.models.database import BaseTableModel
+
+
+class AggregateFunction(str, Enum):
+    SUM = "SUM"
+    COUNT = "COUNT"
+    MIN = "MIN"
+    MAX = "MAX"
+
+
+class Aggregate(BaseModel):
+    """
+    An aggregated column of the clients aggregate method, e.g.
+    Aggregate(function=AggregateFunction.SUM, column="points").
+    column "*" is only allowed with COUNT.
+    """
+
+    function: AggregateFunction
+    column: str = "*"
+
+
+def render_aggregate_select(
+    table: Type[BaseTableModel], aggregates: dict[str, Aggregate], group_by: list[str]
+) -> str:
+    """
+    The SELECT ... FROM part of an aggregate query, the group_by columns first.
+
+    Raises
+    ------
+    ValueError
+        If a column is not a column of the table, an alias is not an identifier,
+        or there is nothing to aggregate
+    """
+    if not aggregates:
+        raise ValueError("Cannot aggregate without aggregates.")
+
+    table_columns = table.column_names()
+    for col in group_by:
+        if col not in table_columns:
+            raise ValueError(f"{col} is not a column of {table.__tablename__}.")
+    for alias, agg in aggregates.items():
+        if not alias.isidentifier():
+            raise ValueError(f"{alias} is not a valid alias.")
+        if agg.column == "*" and agg.function == AggregateFunction.COUNT:
+            continue
+        if agg.column not in table_columns:
+            raise ValueError(
+                f"Cannot {agg.function.value} {agg.column} of {table.__tablename__}."
+            )
+
+    select_parts = list(group_by) + [
+        f"{agg.function.value}({agg.column}) AS {alias}"
+        for alias, agg in aggregates.items()
+    ]
+    return f"SELECT {', '.join(select_parts)} FROM {table.__tablename__}"
@@ -1,5 +1,7 @@
 from .base import BaseTableModel
 from .reward import Reward
+from .reward_rules import REWARD_RULES_VERSION
+from .reward_cycle_total import RewardCycleTotal
 from .task import Task
 from .task_archive import TaskArchive
 from .task_reviewer import TaskReviewer
@@ -8,8 +10,10 @@ from .types import TaskLinesOfCode, TaskReviewPriority, TaskState, UUID4Str
 from .user import User
 
 __all__ = [
+    "REWARD_RULES_VERSION",
     "BaseTableModel",
     "Reward",
+    "RewardCycleTotal",
     "Task",
     "TaskArchive",
     "TaskLinesOfCode",
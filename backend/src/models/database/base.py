@@ -1,9 +1,64 @@
+from collections import namedtuple
 from datetime import datetime, timezone
 from enum import Enum
+from functools import cache
+from types import NoneType, UnionType
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Self,
+    Sequence,
+    Union,
+    get_args,
+    get_origin,
+)
 
 from pydantic import BaseModel, Field, field_serializer, field_validator
 
 
+def _normalize_datetime(v: datetime) -> datetime:
+    if v.tzinfo is None:
+        return v.replace(tzinfo=timezone.utc)
+    return v.astimezone(timezone.utc)
+
+
+def _db_coercion(annotation: Any) -> Callable[[Any], Any] | None:
+    """
+    The coercion a value read from the database needs to match annotation, None if it does not need any.
+    """
+    if get_origin(annotation) in (Union, UnionType):
+        # Optional fields, None is never coerced
+        annotation = next(a for a in get_args(annotation) if a is not NoneType)
+
+    if annotation is datetime:
+        return _normalize_datetime
+    if annotation is bool:
+        # TinyBool columns come back as 0/1
+        return bool
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        # A dict lookup is way cheaper than calling the enum
+        return {m.value: m for m in annotation}.__getitem__
+    return None
+
+
+# from_db sets the pydantic slots straight through their descriptors
+_set_dict = object.__setattr__
+_set_fields_set = BaseModel.__pydantic_fields_set__.__set__  # type:ignore
+_set_extra = BaseModel.__pydantic_extra__.__set__  # type:ignore
+_set_private = BaseModel.__pydantic_private__.__set__  # type:ignore
+
+# Per table model: (all the fields in order, (field, coercion) of those needing one)
+_hydration_plans: dict[
+    type, tuple[tuple[str, ...], tuple[tuple[str, Callable[[Any], Any]], ...]]
+] = dict()
+# Per (table model, columns): (row namedtuple, coercion of each column)
+_projections: dict[
+    tuple[type, tuple[str, ...]],
+    tuple[type, tuple[Callable[[Any], Any] | None, ...]],
+] = dict()
+
+
 class BaseTableModel(BaseModel):
     __tablename__: str
 
@@ -13,9 +68,7 @@ class BaseTableModel(BaseModel):
     @classmethod
     def normalize_datetimes(cls, v):
         if isinstance(v, datetime):
-            if v.tzinfo is None:
-                return v.replace(tzinfo=timezone.utc)
-            return v.astimezone(timezone.utc)
+            return _normalize_datetime(v)
         return v
 
     @field_serializer("*", when_used="always")
@@ -23,3 +76,115 @@ class BaseTableModel(BaseModel):
         if isinstance(v, Enum):
             return v.value
         return v
+
+    @classmethod
+    @cache
+    def column_names(cls) -> tuple[str, ...]:
+        """
+        The columns of the table, in the order of the fields.
+        They are the field names: the aliases only map the model validated from
+        (e.g. the id of the archived task), and would repeat the id column.
+        """
+        return tuple(cls.model_fields)
+
+    @classmethod
+    def _build_hydration_plan(
+        cls,
+    ) -> tuple[tuple[str, ...], tuple[tuple[str, Callable[[Any], Any]], ...]]:
+        """
+        Returns
+        -------
+        tuple
+            All the fields, in the order of the model
+        tuple
+            The fields needing a coercion, with their coercion
+        """
+        coerced: list[tuple[str, Callable[[Any], Any]]] = list()
+        for name, field in cls.model_fields.items():
+            coerce = _db_coercion(field.annotation)
+            if coerce is not None:
+                coerced.append((name, coerce))
+        _hydration_plans[cls] = (tuple(cls.model_fields), tuple(coerced))
+        return _hydration_plans[cls]
+
+    @classmethod
+    def from_db(cls, row: dict[str, Any]) -> Self:
+        """
+        Build the model from a row of its table, trusting our own schema:
+        only datetimes timezone, tinyint bools and enums are coerced, without running the validation.
+        Falls back to the full validation if the row misses a field.
+        """
+        names, coerced = _hydration_plans.get(cls) or cls._build_hydration_plan()
+        try:
+            # In the order of the fields, as the constructor: dumps have the same keys order
+            values = {name: row[name] for name in names}
+            for name, coerce in coerced:
+                value = values[name]
+                values[name] = None if value is None else coerce(value)
+        except KeyError:
+            return cls(**row)
+
+        model = cls.__new__(cls)
+        _set_dict(model, "__dict__", values)
+        _set_fields_set(model, set(values))
+        _set_extra(model, None)
+        _set_private(model, None)
+        return model
+
+    @classmethod
+    def _build_projection(
+        cls, columns: tuple[str, ...]
+    ) -> tuple[type, tuple[Callable[[Any], Any] | None, ...]]:
+        column_annotations = {
+            name: field.annotation for name, field in cls.model_fields.items()
+        }
+        for col in columns:
+            if col not in column_annotations:
+                raise ValueError(f"{col=} is not a column of {cls.__tablename__}")
+
+        row_type = namedtuple(f"{cls.__name__}Row", columns)  # type:ignore
+        coercions = tuple(_db_coercion(column_annotations[col]) for col in columns)
+        _projections[(cls, columns)] = (row_type, coercions)
+        return _projections[(cls, columns)]
+
+    @classmethod
+    def projection_row_type(cls, columns: Sequence[str]) -> type:
+        """
+        The namedtuple type of the rows holding only the given columns.
+
+        Raises
+        ------
+        ValueError
+            If one of the columns is not a column of the table
+        """
+        columns = tuple(columns)
+        return (_projections.get((cls, columns)) or cls._build_projection(columns))[0]
+
+    @classmethod
+    def rows_from_db(
+        cls, columns: Sequence[str], rows: Iterable[Iterable[Any]]
+    ) -> list[Any]:
+        """
+        Build the projection rows of the given columns, from the database rows holding their values in order.
+        Values are coerced as from_db does, there is no validation.
+
+        Raises
+        ------
+        ValueError
+            If one of the columns is not a column of the table
+        """
+        columns = tuple(columns)
+        row_type, coercions = _projections.get((cls, columns)) or cls._build_projection(
+            columns
+        )
+
+        make = row_type._make  # type:ignore
+        if not any(coercions):
+            return [make(r) for r in rows]
+        return [
+            make(
+                v if coerce is None or v is None else coerce(v)
+                for coerce, v in zip(coercions, r)
+            )
+            for r in rows
+        ]
@@ -0,0 +1,17 @@
+from datetime import date
+
+from .base import BaseTableModel
+
+
+class RewardCycleTotal(BaseTableModel):
+    """
+    Rollup of the rewards of a user over a cycle, maintained with each reward.
+    """
+
+    __tablename__: str = "reward_cycle_totals"
+
+    user_id: int
+    cycle_start: date
+    points: int = 0
+    reviews: int = 0
+    quick_reviews: int = 0
@@ -0,0 +1,59 @@
+"""
+Points of a task reviewer, by (review_priority, lines_of_code, has_been_reviewed_once).
+
+The rules are a table rather than code, read by the tasks listings and
+rendered as SQL by the reward statements. Any change of the points must bump
+REWARD_RULES_VERSION, then run scripts.recompute_task_points to refresh the
+points persisted on the tasks rows.
+"""
+
+from .types import TaskLinesOfCode, TaskReviewPriority
+
+REWARD_RULES_VERSION = 1
+# Points rendered in SQL for the combinations missing from the table
+NO_REWARD_POINTS = 0
+
+_P = TaskReviewPriority
+_L = TaskLinesOfCode
+
+# Combinations without points can not be posted (full review on big pr is muri)
+REWARD_TABLE: dict[tuple[TaskReviewPriority, TaskLinesOfCode, bool], int] = {
+    # Approve only is no big money
+    (_P.APPROVE_ONLY, _L.UNDER_100, False): 5,
+    (_P.APPROVE_ONLY, _L.UNDER_500, False): 5,
+    (_P.APPROVE_ONLY, _L.UNDER_1200, False): 5,
+    (_P.APPROVE_ONLY, _L.ABOVE_1200, False): 5,
+    (_P.APPROVE_ONLY, _L.UNDER_100, True): 5,
+    (_P.APPROVE_ONLY, _L.UNDER_500, True): 5,
+    (_P.APPROVE_ONLY, _L.UNDER_1200, True): 5,
+    (_P.APPROVE_ONLY, _L.ABOVE_1200, True): 5,
+    # Based on evidendence is medium money
+    (_P.BASED_ON_EVIDENCE, _L.UNDER_100, False): 10,
+    (_P.BASED_ON_EVIDENCE, _L.UNDER_500, False): 15,
+    (_P.BASED_ON_EVIDENCE, _L.UNDER_1200, False): 20,
+    (_P.BASED_ON_EVIDENCE, _L.ABOVE_1200, False): 25,
+    (_P.BASED_ON_EVIDENCE, _L.UNDER_100, True): 10,
+    (_P.BASED_ON_EVIDENCE, _L.UNDER_500, True): 10,
+    (_P.BASED_ON_EVIDENCE, _L.UNDER_1200, True): 10,
+    (_P.BASED_ON_EVIDENCE, _L.ABOVE_1200, True): 10,
+    # Full review is big money
+    (_P.FULL_REVIEW, _L.UNDER_100, False): 15,
+    (_P.FULL_REVIEW, _L.UNDER_500, False): 30,
+    (_P.FULL_REVIEW, _L.UNDER_1200, False): 60,
+    (_P.FULL_REVIEW, _L.UNDER_100, True): 10,
+    (_P.FULL_REVIEW, _L.UNDER_500, True): 10,
+    (_P.FULL_REVIEW, _L.UNDER_1200, True): 10,
+}
+
+
+def reward_points(
+    review_priority: TaskReviewPriority,
+    lines_of_code: TaskLinesOfCode,
+    has_been_reviewed_once: bool,
+) -> int | None:
+    """
+    None for the combinations that can not be rewarded.
+    """
+    return REWARD_TABLE.get(
+        (review_priority, lines_of_code, bool(has_been_reviewed_once))
+    )
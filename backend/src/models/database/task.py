@@ -1,8 +1,15 @@
 from datetime import datetime, timezone
+from functools import cache
 
 from pydantic import Field
 
 from .base import BaseTableModel
+from .reward_rules import (
+    NO_REWARD_POINTS,
+    REWARD_RULES_VERSION,
+    REWARD_TABLE,
+    reward_points,
+)
 from .types import TaskLinesOfCode, TaskReviewPriority, TaskState, TinyBool
 
 
@@ -18,35 +25,46 @@ class Task(BaseTableModel):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     approved_at: datetime | None = None
 
+    # Reward of the reviewers, persisted when the task changes, read as is
+    points: int = 0
+    # REWARD_RULES_VERSION the points were computed with
+    points_version: int = 0
+
     def calculate_reward(self) -> int:
-        match self.review_priority:
-            # Approve only is no big money
-            case TaskReviewPriority.APPROVE_ONLY:
-                return 5
-            # Based on evidendence is medium money
-            case TaskReviewPriority.BASED_ON_EVIDENCE:
-                if self.has_been_reviewed_once:
-                    return 10
-                match self.lines_of_code:
-                    case TaskLinesOfCode.UNDER_100:
-                        return 10
-                    case TaskLinesOfCode.UNDER_500:
-                        return 15
-                    case TaskLinesOfCode.UNDER_1200:
-                        return 20
-                    case TaskLinesOfCode.ABOVE_1200:
-                        return 25
-            # Full review is big money
-            case TaskReviewPriority.FULL_REVIEW:
-                # Full review on big pr is muri
-                if self.lines_of_code == TaskLinesOfCode.ABOVE_1200:
-                    raise ValueError("Cannot full review, too many lines.")
-                if self.has_been_reviewed_once:
-                    return 10
-                match self.lines_of_code:
-                    case TaskLinesOfCode.UNDER_100:
-                        return 15
-                    case TaskLinesOfCode.UNDER_500:
-                        return 30
-                    case TaskLinesOfCode.UNDER_1200:
-                        return 60
+        """
+        For the writes only, the reads use the persisted points.
+
+        Raises
+        ------
+        ValueError
+            If the task can not be rewarded (full review on big pr)
+        """
+        points = reward_points(
+            self.review_priority, self.lines_of_code, self.has_been_reviewed_once
+        )
+        if points is None:
+            raise ValueError("Cannot full review, too many lines.")
+        return points
+
+    def refresh_points(self) -> None:
+        """
+        Persist the reward under the current rules, before writing the task.
+        """
+        self.points = self.calculate_reward()
+        self.points_version = REWARD_RULES_VERSION
+
+    @classmethod
+    @cache
+    def calculate_reward_sql(cls, alias: str) -> str:
+        """
+        calculate_reward as a SQL expression over the columns of the tasks table aliased alias.
+        NO_REWARD_POINTS for the combinations without points, which can not be posted.
+        """
+        whens = [
+            f"WHEN {alias}.review_priority = {priority.value}"
+            f" AND {alias}.lines_of_code = {lines_of_code.value}"
+            f" AND {alias}.has_been_reviewed_once = {int(reviewed_once)}"
+            f" THEN {points}"
+            for (priority, lines_of_code, reviewed_once), points in REWARD_TABLE.items()
+        ]
+        return f"CASE {' '.join(whens)} ELSE {NO_REWARD_POINTS} END"
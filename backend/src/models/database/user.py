@@ -14,3 +14,5 @@ class User(BaseTableModel):
     google_sub: str | None = Field(default=None, max_length=255)
     user_name: str = Field(max_length=255)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # Bumped by the writes of the columns claimed by the session tokens
+    version: int = 1
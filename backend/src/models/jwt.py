@@ -2,7 +2,14 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
+from .database import UUID4Str
+
 
 class JwtPlayload(BaseModel):
     user_id: int
     exp: datetime
+    # Claims of the user, only in the claims mode of the session
+    public_id: UUID4Str | None = None
+    user_name: str | None = None
+    version: int | None = None
+    iat: datetime | None = None
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+from .database import UUID4Str
+
+
+class Principal(BaseModel):
+    """
+    The logged in user, as known by the read endpoints.
+    """
+
+    id: int
+    public_id: UUID4Str
+    user_name: str
+    version: int
@@ -1,20 +1,44 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
+from typing import TypeVar
 
 import jwt
-from fastapi import Cookie, HTTPException
-from fastapi.responses import RedirectResponse
+from cachetools import TLRUCache
+from fastapi import Cookie, HTTPException, Response
 from src.clients.mysql import AMysqlClientReader, AMySqlIdNotFoundError
 from src.config.auth import auth_config
 from src.config.env import ENV, ServiceEnv
 from src.models.database import User
 from src.models.jwt import JwtPlayload
+from src.models.principal import Principal
+from src.modules.user_cache import (
+    cache_user,
+    get_cached_user,
+    get_cached_user_version,
+)
 
+ResponseT = TypeVar("ResponseT", bound=Response)
 
-async def get_current_user(
-    session: str = Cookie(None, alias=auth_config.session.session_token_keyword)
-) -> User:
-    if not session:
-        raise HTTPException(401, "Not logged in")
+# Payloads of the verified session tokens by digest of the token, until their exp
+_verified_sessions: TLRUCache[bytes, JwtPlayload] = TLRUCache(
+    maxsize=auth_config.session.verified_session_cache_maxsize,
+    ttu=lambda _, jwt_payload, __: jwt_payload.exp.timestamp(),
+    timer=time.time,
+)
+
+
+def _verify_session(session: str) -> JwtPlayload:
+    """
+    Raises
+    ------
+    HTTPException
+        401 if the session token is invalid or expired
+    """
+    digest = hashlib.sha256(session.encode()).digest()
+    # Expired entries are never returned
+    if (jwt_payload := _verified_sessions.get(digest)) is not None:
+        return jwt_payload
 
     try:
         jwt_payload = JwtPlayload(
@@ -22,31 +46,114 @@ async def get_current_user(
                 session,
                 auth_config.jwt.secret_key,
                 algorithms=[auth_config.jwt.algorithm],
+                options={"require": ["exp"]},
             )
         )
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(401, "Session expired")
     except:
         raise HTTPException(401, "Invalid session")
 
-    ## TODO: do something
-    if jwt_payload.exp > datetime.now(timezone.utc):
-        pass
+    _verified_sessions[digest] = jwt_payload
+    return jwt_payload
+
+
+async def get_current_user(
+    session: str = Cookie(None, alias=auth_config.session.session_token_keyword)
+) -> User:
+    if not session:
+        raise HTTPException(401, "Not logged in")
 
-    reader = AMysqlClientReader()
+    return await _load_user(_verify_session(session).user_id)
+
+
+async def _load_user(user_id: int) -> User:
+    evictions, user = get_cached_user(user_id)
+    if user is not None:
+        return user
+
+    reader = AMysqlClientReader(prepared_statements=True)
 
     try:
-        return await reader.select_by_id(table=User, id=jwt_payload.user_id)
+        user = await reader.select_by_id(table=User, id=user_id)
     except AMySqlIdNotFoundError:
         raise HTTPException(401, "User not found")
+    cache_user(user, evictions)
+    return user
+
+
+def _principal_from_claims(jwt_payload: JwtPlayload) -> Principal | None:
+    """
+    None if the token has no claims or if they may be stale: older than
+    session_claims_max_age, or of another version than the user row this worker knows.
+    """
+    if (
+        jwt_payload.public_id is None
+        or jwt_payload.user_name is None
+        or jwt_payload.version is None
+        or jwt_payload.iat is None
+    ):
+        return None
+    age = datetime.now(timezone.utc) - jwt_payload.iat
+    if age.total_seconds() > auth_config.session.session_claims_max_age:
+        return None
+    cached_version = get_cached_user_version(jwt_payload.user_id)
+    if cached_version is not None and cached_version != jwt_payload.version:
+        return None
+    return Principal(
+        id=jwt_payload.user_id,
+        public_id=jwt_payload.public_id,
+        user_name=jwt_payload.user_name,
+        version=jwt_payload.version,
+    )
+
+
+async def get_current_principal(
+    response: Response,
+    session: str = Cookie(None, alias=auth_config.session.session_token_keyword),
+) -> Principal:
+    """
+    The logged in user of the read endpoints, from the claims of the session token
+    while they are fresh, without touching the database. Otherwise loaded like in
+    get_current_user, and the token re-issued with fresh claims, same expiry.
+    """
+    if not session:
+        raise HTTPException(401, "Not logged in")
+
+    jwt_payload = _verify_session(session)
+    if (principal := _principal_from_claims(jwt_payload)) is not None:
+        return principal
+
+    user = await _load_user(jwt_payload.user_id)
+    if auth_config.session.session_claims:
+        set_login_cookies(response, user, exp=jwt_payload.exp)
+    return Principal(
+        id=user.id,
+        public_id=user.public_id,
+        user_name=user.user_name,
+        version=user.version,
+    )
 
 
-def set_login_cookies(response: RedirectResponse, user: User) -> RedirectResponse:
+def set_login_cookies(
+    response: ResponseT, user: User, exp: datetime | None = None
+) -> ResponseT:
+    """
+    Sets the session token of user, expiring at exp, by default in expiration_days.
+    In the claims mode, user must be the full row read from the database.
+    """
+    now = datetime.now(timezone.utc)
     jwt_playload = JwtPlayload(
         user_id=user.id,
-        exp=datetime.now(timezone.utc)
-        + timedelta(days=auth_config.session.expiration_days),
+        exp=exp or now + timedelta(days=auth_config.session.expiration_days),
     )
+    if auth_config.session.session_claims:
+        jwt_playload.public_id = user.public_id
+        jwt_playload.user_name = user.user_name
+        jwt_playload.version = user.version
+        jwt_playload.iat = now
     jwt_token = jwt.encode(
-        payload=jwt_playload.model_dump(),
+        payload=jwt_playload.model_dump(exclude_none=True),
         key=auth_config.jwt.secret_key,
         algorithm=auth_config.jwt.algorithm,
     )
@@ -57,13 +164,13 @@ def set_login_cookies(response: RedirectResponse, user: User) -> RedirectRespons
         httponly=True,
         secure=ENV != ServiceEnv.LOCAL,
         samesite="lax",
-        max_age=3600 * 24 * auth_config.session.expiration_days,
+        max_age=int((jwt_playload.exp - now).total_seconds()),
         domain=None,  # TODO: needed if backend/frontend different domains
     )
     return response
 
 
-def delete_loging_cookies(response: RedirectResponse) -> RedirectResponse:
+def delete_loging_cookies(response: ResponseT) -> ResponseT:
     response.delete_cookie(
         key=auth_config.session.session_token_keyword,
         httponly=True,
@@ -1,4 +1,4 @@
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta, timezone
 from enum import Enum
 
 
@@ -12,14 +12,31 @@ class DayOfTheWeek(int, Enum):
     SUNDAY = 6
 
 
+CYCLE_START_DAY = DayOfTheWeek.TUESDAY
+
+
+def get_today() -> date:
+    """
+    Today in UTC, the clock the rewards are dated and their cycles computed with.
+    """
+    return datetime.now(timezone.utc).date()
+
+
+def get_cycle_start(day: date, cycle_start_day: DayOfTheWeek = CYCLE_START_DAY) -> date:
+    """
+    First day of the cycle containing day.
+    """
+    return day - timedelta(days=(day.weekday() - cycle_start_day.value) % 7)
+
+
 def get_first_day_of_cycle(
-    cycle_offset: int = 0, cycle_start_day: DayOfTheWeek = DayOfTheWeek.TUESDAY
+    cycle_offset: int = 0, cycle_start_day: DayOfTheWeek = CYCLE_START_DAY
 ) -> date:
     """
     Cycle offset goes backward.
     cycle_offset = 0 -> current cycle
     cycle_offset = 1 -> previous cycle
     """
-    return date.today() - timedelta(
-        days=(date.today().weekday() - cycle_start_day.value) % 7 + (7 * cycle_offset)
+    return get_cycle_start(get_today(), cycle_start_day) - timedelta(
+        days=7 * cycle_offset
     )
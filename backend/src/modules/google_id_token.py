@@ -0,0 +1,93 @@
+"""
+Local verification of the ID tokens of Google OpenID Connect.
+
+The signing keys are fetched from the JWKS endpoint of the provider and kept
+for jwks_refresh_interval, or fetched again sooner when a token is signed with
+an unknown key (key rotation), at most once per JWKS_MIN_REFRESH_INTERVAL.
+"""
+
+import asyncio
+import time
+
+import httpx
+import jwt
+from pydantic import BaseModel
+from src.clients.http import get_http_client
+from src.config.auth import auth_config
+
+# Seconds between two fetches of the keys triggered by an unknown key id
+JWKS_MIN_REFRESH_INTERVAL = 60
+
+
+class InvalidIdToken(ValueError):
+    pass
+
+
+class GoogleIdToken(BaseModel):
+    sub: str
+    email: str | None = None
+    name: str | None = None
+
+
+_jwks: jwt.PyJWKSet | None = None
+_jwks_fetched_at: float = 0
+_jwks_lock = asyncio.Lock()
+
+
+async def _fetch_jwks() -> jwt.PyJWKSet:
+    global _jwks, _jwks_fetched_at
+    response = await get_http_client().get(auth_config.google.jwks_url)
+    response.raise_for_status()
+    _jwks = jwt.PyJWKSet.from_dict(response.json())
+    _jwks_fetched_at = time.monotonic()
+    return _jwks
+
+
+async def _get_signing_key(kid: str) -> jwt.PyJWK:
+    """
+    Raises
+    ------
+    InvalidIdToken
+        If no key of the provider has this id
+    """
+    async with _jwks_lock:
+        age = time.monotonic() - _jwks_fetched_at
+        jwks = _jwks
+        if jwks is None or age > auth_config.google.jwks_refresh_interval:
+            jwks = await _fetch_jwks()
+        elif kid not in {key.key_id for key in jwks.keys}:
+            if age < JWKS_MIN_REFRESH_INTERVAL:
+                raise InvalidIdToken(f"Unknown signing key {kid=}")
+            jwks = await _fetch_jwks()
+
+    try:
+        return jwks[kid]
+    except KeyError:
+        raise InvalidIdToken(f"Unknown signing key {kid=}")
+
+
+async def verify_google_id_token(id_token: str) -> GoogleIdToken:
+    """
+    Checks the signature, issuer, audience (our client id) and expiry of the token.
+
+    Raises
+    ------
+    InvalidIdToken
+        If the token is not a valid ID token of the provider for us
+    """
+    try:
+        kid = jwt.get_unverified_header(id_token).get("kid")
+        if not kid:
+            raise InvalidIdToken("ID token without key id")
+        signing_key = await _get_signing_key(kid)
+        claims = jwt.decode(
+            id_token,
+            key=signing_key,
+            algorithms=["RS256"],
+            audience=auth_config.google.client_id,
+            issuer=auth_config.google.issuers,
+            options={"require": ["exp", "iat", "sub"]},
+        )
+    except (jwt.PyJWTError, httpx.HTTPError) as e:
+        raise InvalidIdToken(str(e))
+    return GoogleIdToken.model_validate(claims)
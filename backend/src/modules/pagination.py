@@ -0,0 +1,59 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, TypeVar
+
+from pydantic import TypeAdapter
+
+# Upper bound of the page size asked by the clients of the list endpoints
+MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {value!r} in a cursor.")
+
+
+def encode_cursor(keyset: tuple) -> str:
+    """
+    Opaque token of the keyset of the last row of a page, to fetch the next one.
+    """
+    payload = json.dumps(keyset, default=_to_json, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+# Per keyset type, e.g. tuple[datetime, int]
+_keyset_adapters: dict[Any, TypeAdapter] = dict()
+
+
+def _keyset_adapter(keyset_type: type[T]) -> TypeAdapter[T]:
+    adapter = _keyset_adapters.get(keyset_type)
+    if adapter is None:
+        adapter = _keyset_adapters[keyset_type] = TypeAdapter(keyset_type)
+    return adapter
+
+
+def decode_cursor(cursor: str, keyset_type: type[T]) -> T:
+    """
+    Keyset of a token made by encode_cursor, validated against keyset_type,
+    e.g. tuple[datetime, int].
+
+    Raises
+    ------
+    InvalidCursor
+        If the token was not made by encode_cursor, or holds another keyset type
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return _keyset_adapter(keyset_type).validate_json(payload)
+    except ValueError:
+        # Also a bad base64 padding or a ValidationError
+        raise InvalidCursor()
@@ -0,0 +1,42 @@
+import math
+import time
+
+from fastapi import Request, Response
+from src.clients.mysql import start_primary_pin
+from src.config.env import ENV, ServiceEnv
+from src.config.mysql import mysql_config
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+PRIMARY_PIN_COOKIE = "primary_pin_until"
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """
+    Keeps the reads of a user on the primary for a short window after they wrote,
+    across requests (and workers) through a cookie.
+    """
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        now = time.time()
+        try:
+            cookie_until = float(request.cookies.get(PRIMARY_PIN_COOKIE, 0))
+        except ValueError:
+            cookie_until = 0
+        # Bounded, a forged cookie cannot pin the user to the primary for longer
+        until = min(cookie_until, now + mysql_config.read_your_writes_window)
+
+        pin = start_primary_pin(until)
+        response = await call_next(request)
+
+        if pin.until > until:
+            response.set_cookie(
+                key=PRIMARY_PIN_COOKIE,
+                value=str(pin.until),
+                max_age=math.ceil(mysql_config.read_your_writes_window),
+                httponly=True,
+                secure=ENV != ServiceEnv.LOCAL,
+                samesite="lax",
+            )
+        return response
@@ -0,0 +1,79 @@
+"""
+Per worker cache of the users identified by get_current_user.
+
+The writes of a user row in this worker evict it (evict_cached_user, e.g. on a
+login), the other users stay cached. The writes of other workers are seen
+once the entry expires, after user_cache_ttl.
+"""
+
+from dataclasses import dataclass
+
+from cachetools import TTLCache
+from src.config.auth import auth_config
+from src.models.database import User
+
+
+@dataclass
+class UserCacheStats:
+    hits: int = 0
+    misses: int = 0
+    size: int = 0
+    maxsize: int = 0
+
+
+_users: TTLCache[int, User] = TTLCache(
+    maxsize=auth_config.session.user_cache_maxsize,
+    ttl=auth_config.session.user_cache_ttl,
+)
+# Bumped by each eviction, a user read before one may be the evicted row
+_evictions = 0
+_stats = UserCacheStats()
+
+
+def get_user_cache_stats() -> UserCacheStats:
+    return UserCacheStats(
+        hits=_stats.hits,
+        misses=_stats.misses,
+        size=int(_users.currsize),
+        maxsize=int(_users.maxsize),
+    )
+
+
+def get_cached_user(user_id: int) -> tuple[int, User | None]:
+    """
+    Returns
+    -------
+    int
+        The evictions count, to cache the user read on a miss with
+    User | None
+        A copy of the cached user, None on a miss
+    """
+    user = _users.get(user_id)
+    if user is None:
+        _stats.misses += 1
+        return _evictions, None
+    _stats.hits += 1
+    # A copy, the cached one is shared by the requests
+    return _evictions, user.model_copy()
+
+
+def get_cached_user_version(user_id: int) -> int | None:
+    """
+    The version of the user row if cached, not counted in the stats.
+    """
+    user = _users.get(user_id)
+    return None if user is None else user.version
+
+
+def cache_user(user: User, evictions: int) -> None:
+    """
+    Not cached if a user was evicted since the read, it may be the row read.
+    """
+    if evictions == _evictions:
+        _users[user.id] = user.model_copy()
+
+
+def evict_cached_user(user_id: int) -> None:
+    global _evictions
+    _evictions += 1
+    _users.pop(user_id, None)
@@ -0,0 +1,79 @@
+"""
+Benchmark of AMysqlClientWriter.insert throughput.
+
+Inserts NB_ROWS users with the former single statement insert (one named
+placeholder per cell, lastrowid + n) and with the chunked executemany insert,
+and prints the rows per second of both.
+Needs the configured database, the rows it creates are deleted at the end.
+"""
+
+import asyncio
+import time
+from typing import Any
+
+from src.clients.mysql.async_client import AMysqlClientWriter
+from src.models.database import User, UUID4Str
+
+NB_ROWS = 20_000
+
+
+async def _legacy_insert(writer: AMysqlClientWriter, to_insert: list[User]) -> None:
+    """
+    The former insert: a single INSERT ... VALUES with a placeholder per cell.
+    """
+    to_insert_dict = [
+        e.model_dump(exclude={"createdAt", "updatedAt", "id"}) for e in to_insert
+    ]
+    cols = list(to_insert_dict[0].keys())
+    insert_part = list()
+    args: dict[str, Any] = dict()
+    for row in to_insert_dict:
+        uids_sql = writer.update_args_get_uids_sql(
+            args=args, ls_val=[row[col] for col in cols]
+        )
+        insert_part.append(f"({",".join(uids_sql)})")
+    query = (
+        f"INSERT INTO {User.__tablename__} ({",".join(cols)})"
+        f" VALUES {",".join(insert_part)} ;"
+    )
+    first_id_inserted = await writer.execute(query=query, args=args, insertion=True)
+    for offset, item in enumerate(to_insert):
+        item.id = first_id_inserted + offset
+
+
+async def _run(insert, writer: AMysqlClientWriter, user_name: str) -> float:
+    """
+    Returns the rows inserted per second.
+    """
+    users = [User(user_name=user_name, email=f"{i}@bench.io") for i in range(NB_ROWS)]
+    start = time.perf_counter()
+    await insert(users)
+    elapsed = time.perf_counter() - start
+    return NB_ROWS / elapsed
+
+
+async def _bench() -> None:
+    writer = AMysqlClientWriter()
+    user_name = f"bench insert {UUID4Str.new()}"
+
+    try:
+        legacy = await _run(
+            lambda users: _legacy_insert(writer, users), writer, user_name
+        )
+        chunked = await _run(writer.insert, writer, user_name)
+        print(
+            f"{NB_ROWS} rows:"
+            f" single statement {legacy:9.1f} rows/s,"
+            f" chunked executemany {chunked:9.1f} rows/s,"
+            f" x{chunked / legacy:.1f}"
+        )
+    finally:
+        await writer.delete(table=User, cond_equal=dict(user_name=user_name))
+
+
+def main() -> None:
+    asyncio.run(_bench())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark of the PATCH task actions throughput.
+
+Runs cycles of approve -> re-open -> request changes -> changes addressed on
+NB_TASKS tasks concurrently, with the former read-then-write services and
+with the guarded single statement transitions of patch_task_service.
+Needs the configured database, the rows it creates are deleted at the end.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from src.api.tasks.models import UpdateAction
+from src.api.tasks.service import patch_task_service
+from src.clients.mysql.async_client import AMysqlClientReader, AMysqlClientWriter
+from src.models.database import (
+    Reward,
+    RewardCycleTotal,
+    Task,
+    TaskLinesOfCode,
+    TaskReviewer,
+    TaskReviewPriority,
+    TaskState,
+    User,
+    UUID4Str,
+)
+
+NB_TASKS = 20
+NB_CYCLES = 10
+
+# One cycle goes back to PENDING_REVIEW, (action, done by the reviewer)
+_CYCLE = [
+    (UpdateAction.APPROVE, True),
+    (UpdateAction.RE_OPEN_QUICK_REVIEW, False),
+    (UpdateAction.REQUEST_CHANGES, True),
+    (UpdateAction.CHANGES_ADDRESSED, False),
+]
+
+
+async def _legacy_patch_task(user: User, task_id: int, action: UpdateAction) -> None:
+    """
+    The former services: read the task (and creator, reviewer), then write.
+    """
+    reader = AMysqlClientReader()
+    writer = AMysqlClientWriter()
+    task = await reader.select_by_id(table=Task, id=task_id)
+
+    if action in (UpdateAction.APPROVE, UpdateAction.REQUEST_CHANGES):
+        approved = action == UpdateAction.APPROVE
+        creator = await reader.select_by_id(table=User, id=task.creator_id)
+        await reader.select(
+            table=TaskReviewer, cond_equal=dict(user_id=user.id, task_id=task.id)
+        )
+        await writer.insert_one(
+            Reward(
+                user_id=user.id,
+                task_id=task.id,
+                points=task.calculate_reward(),
+                was_quick_review=task.has_been_reviewed_once,
+                pr_link=task.pr_link,
+                creator_public_id=creator.public_id,
+                creator_user_name=creator.user_name,
+                review_priority=task.review_priority,
+                lines_of_code=task.lines_of_code,
+            )
+        )
+        col_to_value_map = dict(
+            has_been_reviewed_once=1,
+            state=(
+                TaskState.APPROVED.value
+                if approved
+                else TaskState.PENDING_CHANGES.value
+            ),
+            approved_at=datetime.now(timezone.utc) if approved else None,
+        )
+    elif action == UpdateAction.CHANGES_ADDRESSED:
+        col_to_value_map = dict(state=TaskState.PENDING_REVIEW.value)
+    else:
+        col_to_value_map = dict(
+            state=TaskState.PENDING_REVIEW.value,
+            approved_at=None,
+            has_been_reviewed_once=True,
+        )
+    # update_by_id, with its existence check
+    await reader.select_by_id(table=Task, id=task.id)
+    await writer.update_by_id(table=Task, id=task.id, col_to_value_map=col_to_value_map)
+
+
+async def _run(patch, creator: User, reviewer: User, tasks: list[Task]) -> float:
+    """
+    Returns the PATCH per second.
+    """
+
+    async def cycles(task: Task) -> None:
+        for _ in range(NB_CYCLES):
+            for action, by_reviewer in _CYCLE:
+                await patch(reviewer if by_reviewer else creator, task.id, action)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[cycles(t) for t in tasks])
+    elapsed = time.perf_counter() - start
+    return len(tasks) * NB_CYCLES * len(_CYCLE) / elapsed
+
+
+async def _bench() -> None:
+    writer = AMysqlClientWriter()
+    run_id = UUID4Str.new()
+
+    creator = User(user_name="bench creator")
+    reviewer = User(user_name="bench reviewer")
+    tasks: list[Task] = list()
+    async with writer.transaction():
+        # One by one, so that the ids are right on the SQLite stand-in too
+        await writer.insert_one(creator)
+        await writer.insert_one(reviewer)
+        for i in range(NB_TASKS):
+            task = Task(
+                creator_id=creator.id,
+                review_priority=TaskReviewPriority.BASED_ON_EVIDENCE,
+                lines_of_code=TaskLinesOfCode.UNDER_500,
+                pr_link=f"https://github.com/bench/{run_id}/pull/{i}",
+                state=TaskState.PENDING_REVIEW,
+            )
+            await writer.insert_one(task)
+            await writer.insert_one(TaskReviewer(user_id=reviewer.id, task_id=task.id))
+            tasks.append(task)
+
+    try:
+        legacy = await _run(_legacy_patch_task, creator, reviewer, tasks)
+        guarded = await _run(patch_task_service, creator, reviewer, tasks)
+        print(
+            f"{NB_TASKS} tasks x {NB_CYCLES * len(_CYCLE)} PATCH:"
+            f" read-then-write {legacy:7.1f} PATCH/s,"
+            f" guarded {guarded:7.1f} PATCH/s,"
+            f" x{guarded / legacy:.1f}"
+        )
+    finally:
+        task_ids = [t.id for t in tasks]
+        await writer.delete(table=Reward, cond_in=dict(task_id=task_ids))
+        await writer.delete(
+            table=RewardCycleTotal, cond_equal=dict(user_id=reviewer.id)
+        )
+        await writer.delete(table=TaskReviewer, cond_in=dict(task_id=task_ids))
+        await writer.delete(table=Task, cond_in=dict(id=task_ids))
+        await writer.delete(table=User, cond_in=dict(id=[creator.id, reviewer.id]))
+
+
+def main() -> None:
+    asyncio.run(_bench())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Micro-benchmark of the per-query build cost of AMysqlClient.select.
+
+Compares the former build (string assembly and one uuid4 placeholder per
+value on every call) with the shape-keyed query cache, on the queries
+issued by get_todo_service. No database is needed.
+"""
+
+import timeit
+from typing import Any
+from uuid import uuid4
+
+from src.clients.mysql.async_client import AMysqlClientReader
+from src.models.database import BaseTableModel, Task, TaskReviewer, User
+
+NB_RUNS = 20_000
+
+
+def _legacy_uuid4() -> str:
+    return "id_" + str(uuid4()).replace("-", "_")
+
+
+def _legacy_compile_select(
+    table: type[BaseTableModel],
+    cond_in: dict[str, list] = dict(),
+    cond_equal: dict[str, Any] = dict(),
+) -> tuple[str, dict[str, Any]]:
+    conds = ["WHERE 1 = 1"]
+    args: dict[str, Any] = dict()
+    for col, ls_val in cond_in.items():
+        if len(ls_val) == 0:
+            conds.append("AND 1 = 0")
+            continue
+        uids = [_legacy_uuid4() for _ in range(len(ls_val))]
+        args.update({uid: value for uid, value in zip(uids, ls_val)})
+        conds.append(f"AND {col} IN (" + ",".join(f":{uid}" for uid in uids) + ")")
+    for col, val in cond_equal.items():
+        uid = _legacy_uuid4()
+        conds.append(f"AND {col} = :{uid}")
+        args[uid] = val
+    query_parts = [f"SELECT * FROM {table.__tablename__}", " ".join(conds), ";"]
+    return " ".join(query_parts), args
+
+
+def main() -> None:
+    reader = AMysqlClientReader()
+
+    task_ids = list(range(1, 8))
+    user_ids = list(range(1, 13))
+    todo_queries: list[tuple[type[BaseTableModel], dict[str, Any]]] = [
+        (TaskReviewer, dict(cond_equal=dict(user_id=3))),
+        (Task, dict(cond_in=dict(id=task_ids), cond_equal=dict(state=1))),
+        (TaskReviewer, dict(cond_in=dict(task_id=task_ids))),
+        (User, dict(cond_in=dict(id=user_ids))),
+    ]
+
+    def legacy() -> None:
+        for table, conds in todo_queries:
+            _legacy_compile_select(table, **conds)
+
+    def cached() -> None:
+        for table, conds in todo_queries:
+            reader._compile_select(
+                table=table,
+                cond_null=list(),
+                cond_not_null=list(),
+                cond_in=conds.get("cond_in", dict()),
+                cond_equal=conds.get("cond_equal", dict()),
+                cond_non_equal=dict(),
+                cond_less_or_eq=dict(),
+                cond_greater_or_eq=dict(),
+                cond_less=dict(),
+                cond_greater=dict(),
+                order_by="",
+                ascending_order=True,
+                limit=0,
+                offset=0,
+            )
+
+    nb_queries = NB_RUNS * len(todo_queries)
+    for name, fn in (
+        ("before (uuid4 placeholders)", legacy),
+        ("after (query cache)", cached),
+    ):
+        duration = timeit.timeit(fn, number=NB_RUNS)
+        print(f"{name:<30} {duration / nb_queries * 1e6:8.2f} us/query")
+
+
+if __name__ == "__main__":
+    main()
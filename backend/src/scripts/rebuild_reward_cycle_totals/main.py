@@ -0,0 +1,46 @@
+"""
+Rebuild the reward_cycle_totals rollup from the rewards table.
+
+The existing rewards are backfilled by the migration creating the table, this
+repairs a drift of the totals (e.g. rewards edited by hand). Runs in a single transaction, the totals are
+never seen partially rebuilt.
+"""
+
+from src.clients.mysql import MysqlClientReader, MysqlClientWriter
+from src.models.database import Reward, RewardCycleTotal
+from src.modules.date import CYCLE_START_DAY
+
+# WEEKDAY is 0 on mondays, as date.weekday, %% is a % escaped for pymysql
+_REBUILD_TOTALS = f"""
+INSERT INTO {RewardCycleTotal.__tablename__} (
+    user_id, cycle_start, points, reviews, quick_reviews
+)
+SELECT
+    user_id,
+    DATE(created_at) - INTERVAL (WEEKDAY(created_at) - %s + 7) %% 7 DAY AS cycle_start,
+    SUM(points),
+    COUNT(*),
+    SUM(was_quick_review)
+FROM {Reward.__tablename__}
+GROUP BY user_id, cycle_start ;
+"""
+
+
+def main() -> None:
+    writer = MysqlClientWriter()
+    writer.start_transaction()
+    try:
+        writer.execute(query=f"DELETE FROM {RewardCycleTotal.__tablename__} ;")
+        writer.execute(query=_REBUILD_TOTALS, args=(CYCLE_START_DAY.value,))
+    except Exception:
+        writer.rollback()
+        raise
+    writer.commit()
+
+    reader = MysqlClientReader()
+    print(f"Rebuilt {reader.count(RewardCycleTotal)} reward cycle totals.")
+    reader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Recompute the points persisted on the tasks rows, after a change of the reward rules.
+
+Run it once REWARD_RULES_VERSION is bumped and deployed. Only the tasks
+computed with other rules are written, in a single statement. Until then the
+listings show the points of the rules the tasks were written with.
+"""
+
+import asyncio
+
+from src.clients.mysql.async_client import AMysqlClientWriter
+from src.models.database import REWARD_RULES_VERSION, Task
+
+_RECOMPUTE_POINTS = f"""
+UPDATE {Task.__tablename__} AS t
+SET points = {Task.calculate_reward_sql("t")}, points_version = :points_version
+WHERE t.points_version <> :points_version ;
+"""
+
+
+async def _recompute() -> int:
+    writer = AMysqlClientWriter()
+    return await writer.execute(
+        query=_RECOMPUTE_POINTS,
+        args=dict(points_version=REWARD_RULES_VERSION),
+        affected_rows=True,
+    )
+
+
+def main() -> None:
+    recomputed = asyncio.run(_recompute())
+    print(
+        f"Recomputed the points of {recomputed} tasks, rules v{REWARD_RULES_VERSION}."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Prints the top statements of a running backend, by fingerprint.
+
+Reads GET /api/monitoring/queries of the backend at BACKEND_HOST:BACKEND_PORT,
+which needs FLAG_MONITORING_ENDPOINTS and MYSQL_QUERY_TELEMETRY enabled. The
+statistics are the ones of the worker answering the request.
+"""
+
+import httpx
+from src.config.backend import backend_config
+
+BACKEND_URL = f"http://{backend_config.host}:{backend_config.port}"
+TOP_N = 20
+# total_time, count, rows, max_time or pool_wait
+ORDER = "total_time"
+
+
+def main() -> None:
+    response = httpx.get(
+        f"{BACKEND_URL}/api/monitoring/queries",
+        params=dict(limit=TOP_N, order=ORDER),
+    )
+    response.raise_for_status()
+
+    print(f"{'total ms':>10} {'count':>7} {'avg ms':>8} {'max ms':>8} {'rows':>8}")
+    for query in response.json():
+        print(
+            f"{query['total_ms']:10.1f} {query['count']:7d} {query['avg_ms']:8.2f}"
+            f" {query['max_ms']:8.2f} {query['rows']:8d}  {query['fingerprint']}"
+        )
+        for caller, count in query["callers"].items():
+            print(f"{'':45}{count:7d} from {caller}")
+
+
+if __name__ == "__main__":
+    main()
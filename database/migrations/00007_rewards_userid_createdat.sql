@@ -0,0 +1,3 @@
+-- depends: 00006_task_reviewer_archives
+CREATE INDEX `idx_rewards_userid_createdat`
+ON `rewards` (`user_id`, `created_at`);
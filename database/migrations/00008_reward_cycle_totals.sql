@@ -0,0 +1,26 @@
+-- depends: 00007_rewards_userid_createdat
+CREATE TABLE `reward_cycle_totals` (
+    id INT UNSIGNED NOT NULL AUTO_INCREMENT,
+    user_id INT UNSIGNED NOT NULL,
+    cycle_start DATE NOT NULL COMMENT 'first day of the cycle of the rewards',
+    points INT UNSIGNED NOT NULL DEFAULT 0,
+    reviews INT UNSIGNED NOT NULL DEFAULT 0,
+    quick_reviews INT UNSIGNED NOT NULL DEFAULT 0,
+    CONSTRAINT `uc_rewardcycletotals_cyclestart_userid`
+    UNIQUE (`cycle_start`, `user_id`),
+    PRIMARY KEY (`id`)
+);
+
+-- Backfill from the existing rewards, dated in UTC. Cycles start on tuesdays
+-- (CYCLE_START_DAY, WEEKDAY is 0 on mondays), as get_cycle_start
+INSERT INTO `reward_cycle_totals` (
+    user_id, cycle_start, points, reviews, quick_reviews
+)
+SELECT
+    user_id,
+    DATE(created_at) - INTERVAL (WEEKDAY(created_at) - 1 + 7) % 7 DAY AS cycle_start,
+    SUM(points),
+    COUNT(*),
+    SUM(was_quick_review)
+FROM `rewards`
+GROUP BY user_id, cycle_start;
@@ -0,0 +1,73 @@
+-- depends: 00008_reward_cycle_totals
+
+-- Users created twice by concurrent first logins, merged into the first one (lowest id)
+CREATE TEMPORARY TABLE `users_duplicates` AS
+SELECT u.id AS duplicate_id, k.keep_id
+FROM `users` AS u
+JOIN (
+    SELECT google_sub, MIN(id) AS keep_id
+    FROM `users`
+    WHERE google_sub IS NOT NULL
+    GROUP BY google_sub
+    HAVING COUNT(*) > 1
+) AS k ON k.google_sub = u.google_sub AND u.id <> k.keep_id;
+
+UPDATE `tasks` AS t
+JOIN `users_duplicates` AS d ON d.duplicate_id = t.creator_id
+SET t.creator_id = d.keep_id;
+
+-- Unique (user_id, task_id): one review per task is left to each kept user,
+-- its own if any, else the first of its duplicates. Reached through the users
+-- of the same google_sub, a temporary table can not be opened twice.
+DELETE tr
+FROM `task_reviewers` AS tr
+JOIN `users_duplicates` AS d ON d.duplicate_id = tr.user_id
+JOIN `users` AS k ON k.id = d.keep_id
+JOIN `users` AS sibling ON sibling.google_sub = k.google_sub
+JOIN `task_reviewers` AS other ON other.task_id = tr.task_id AND other.user_id = sibling.id
+WHERE other.user_id = d.keep_id OR other.id < tr.id;
+
+UPDATE `task_reviewers` AS tr
+JOIN `users_duplicates` AS d ON d.duplicate_id = tr.user_id
+SET tr.user_id = d.keep_id;
+
+UPDATE `rewards` AS r
+JOIN `users_duplicates` AS d ON d.duplicate_id = r.user_id
+SET r.user_id = d.keep_id;
+
+UPDATE `task_archives` AS ta
+JOIN `users_duplicates` AS d ON d.duplicate_id = ta.creator_id
+SET ta.creator_id = d.keep_id;
+
+UPDATE `task_reviewer_archives` AS tra
+JOIN `users_duplicates` AS d ON d.duplicate_id = tra.user_id
+SET tra.user_id = d.keep_id;
+
+-- Unique (cycle_start, user_id): the totals are added to the ones of the kept user
+INSERT INTO `reward_cycle_totals` (user_id, cycle_start, points, reviews, quick_reviews)
+SELECT * FROM (
+    SELECT
+        d.keep_id AS user_id, rct.cycle_start, SUM(rct.points) AS points,
+        SUM(rct.reviews) AS reviews, SUM(rct.quick_reviews) AS quick_reviews
+    FROM `reward_cycle_totals` AS rct
+    JOIN `users_duplicates` AS d ON d.duplicate_id = rct.user_id
+    GROUP BY d.keep_id, rct.cycle_start
+) AS new
+ON DUPLICATE KEY UPDATE
+    points = `reward_cycle_totals`.points + new.points,
+    reviews = `reward_cycle_totals`.reviews + new.reviews,
+    quick_reviews = `reward_cycle_totals`.quick_reviews + new.quick_reviews;
+
+DELETE rct
+FROM `reward_cycle_totals` AS rct
+JOIN `users_duplicates` AS d ON d.duplicate_id = rct.user_id;
+
+DELETE u
+FROM `users` AS u
+JOIN `users_duplicates` AS d ON d.duplicate_id = u.id;
+
+DROP TEMPORARY TABLE `users_duplicates`;
+
+ALTER TABLE `users`
+DROP INDEX `idx_users_googlesub`,
+ADD UNIQUE INDEX `idx_users_googlesub` (`google_sub`);
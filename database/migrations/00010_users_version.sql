@@ -0,0 +1,4 @@
+-- depends: 00009_users_unique_googlesub
+ALTER TABLE `users`
+ADD COLUMN version INT UNSIGNED NOT NULL DEFAULT 1
+COMMENT 'bumped by the writes of the columns claimed by the session tokens';
@@ -0,0 +1,34 @@
+-- depends: 00010_users_version
+ALTER TABLE `tasks`
+ADD COLUMN points INT UNSIGNED NOT NULL DEFAULT 0 COMMENT 'reward of the reviewers, see scripts.recompute_task_points',
+ADD COLUMN points_version INT UNSIGNED NOT NULL DEFAULT 0 COMMENT 'version of the reward rules the points were computed with';
+
+-- Backfill under the version 1 of the reward rules
+UPDATE `tasks` AS t
+SET points = (
+    CASE
+        WHEN t.review_priority = 3 AND t.lines_of_code = 1 AND t.has_been_reviewed_once = 0 THEN 5
+        WHEN t.review_priority = 3 AND t.lines_of_code = 2 AND t.has_been_reviewed_once = 0 THEN 5
+        WHEN t.review_priority = 3 AND t.lines_of_code = 3 AND t.has_been_reviewed_once = 0 THEN 5
+        WHEN t.review_priority = 3 AND t.lines_of_code = 4 AND t.has_been_reviewed_once = 0 THEN 5
+        WHEN t.review_priority = 3 AND t.lines_of_code = 1 AND t.has_been_reviewed_once = 1 THEN 5
+        WHEN t.review_priority = 3 AND t.lines_of_code = 2 AND t.has_been_reviewed_once = 1 THEN 5
+        WHEN t.review_priority = 3 AND t.lines_of_code = 3 AND t.has_been_reviewed_once = 1 THEN 5
+        WHEN t.review_priority = 3 AND t.lines_of_code = 4 AND t.has_been_reviewed_once = 1 THEN 5
+        WHEN t.review_priority = 2 AND t.lines_of_code = 1 AND t.has_been_reviewed_once = 0 THEN 10
+        WHEN t.review_priority = 2 AND t.lines_of_code = 2 AND t.has_been_reviewed_once = 0 THEN 15
+        WHEN t.review_priority = 2 AND t.lines_of_code = 3 AND t.has_been_reviewed_once = 0 THEN 20
+        WHEN t.review_priority = 2 AND t.lines_of_code = 4 AND t.has_been_reviewed_once = 0 THEN 25
+        WHEN t.review_priority = 2 AND t.lines_of_code = 1 AND t.has_been_reviewed_once = 1 THEN 10
+        WHEN t.review_priority = 2 AND t.lines_of_code = 2 AND t.has_been_reviewed_once = 1 THEN 10
+        WHEN t.review_priority = 2 AND t.lines_of_code = 3 AND t.has_been_reviewed_once = 1 THEN 10
+        WHEN t.review_priority = 2 AND t.lines_of_code = 4 AND t.has_been_reviewed_once = 1 THEN 10
+        WHEN t.review_priority = 1 AND t.lines_of_code = 1 AND t.has_been_reviewed_once = 0 THEN 15
+        WHEN t.review_priority = 1 AND t.lines_of_code = 2 AND t.has_been_reviewed_once = 0 THEN 30
+        WHEN t.review_priority = 1 AND t.lines_of_code = 3 AND t.has_been_reviewed_once = 0 THEN 60
+        WHEN t.review_priority = 1 AND t.lines_of_code = 1 AND t.has_been_reviewed_once = 1 THEN 10
+        WHEN t.review_priority = 1 AND t.lines_of_code = 2 AND t.has_been_reviewed_once = 1 THEN 10
+        WHEN t.review_priority = 1 AND t.lines_of_code = 3 AND t.has_been_reviewed_once = 1 THEN 10
+        ELSE 0
+    END
+), points_version = 1;